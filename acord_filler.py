@@ -3,14 +3,32 @@ ACORD PDF Form Filler Pipeline
 Takes extracted binder JSON and fills ACORD 25, 27, and/or 28 PDFs.
 """
 
+import heapq
 import json
+import logging
+import re
 import sys
+import threading
 import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from operator import attrgetter
 from pathlib import Path
+from types import MappingProxyType
 from pypdf import PdfReader, PdfWriter
 from pypdf.generic import NameObject, BooleanObject, TextStringObject
 
+logger = logging.getLogger(__name__)
+
+try:  # optional: C JSON parser, ~2-10x faster on large binder payloads
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 # ── NAIC Code Dictionary ─────────────────────────────────────────────
 NAIC_CODES = {
     "Allstate Fire and Casualty Insurance Company": "29688",
@@ -117,6 +135,10 @@ NAIC_CODES = {
     "Starstone Specialty Insurance Company": "44776",
 }
 
+# Casefolded, read-only view: lookups tolerate capitalization drift in
+# extracted carrier names, and the mapping can't be mutated at runtime.
+_NAIC_CODES_CF = MappingProxyType({k.casefold(): v for k, v in NAIC_CODES.items()})
+
 # ── Configuration ───────────────────────────────────────────────────
 FORM_PATHS = {
     "25": "forms/acord25.pdf",
@@ -127,47 +149,84 @@ FORM_PATHS = {
 
 
 # ── Address Parser ──────────────────────────────────────────────────
-def _parse_address(addr: str) -> dict:
+Addr = namedtuple("Addr", "line1 line2 city state zip")
+
+_EMPTY_ADDR = Addr("", "", "", "", "")
+
+# Fast path for the common "street[, line2], city, ST zip" shape; anything
+# else falls through to the comma-splitting heuristics below.
+# Drops \r in a single C-level pass (str.replace would rescan and copy).
+_ADDR_TRANS = str.maketrans({"\r": None})
+
+_ADDR_RE = re.compile(
+    r"^(?P<line1>[^,]+),\s*(?:(?P<line2>.+),\s*)?(?P<city>[^,]+),\s*"
+    r"(?P<state>[A-Z]{2})\s*(?P<zip>\d{5}(?:-\d{4})?)?\s*$"
+)
+
+
+@lru_cache(maxsize=2048)
+def _parse_address(addr: str) -> Addr:
+    # The same address string is read five times per fill (line1/line2/
+    # city/state/zip), so repeat calls hit the cache. The immutable Addr
+    # keeps cached results safe from accidental mutation.
     if not addr:
-        return {"line1": "", "line2": "", "city": "", "state": "", "zip": ""}
-    addr = addr.replace("\n", ", ").replace("\r", "")
+        return _EMPTY_ADDR
+    addr = addr.replace("\n", ", ").translate(_ADDR_TRANS)
+    m = _ADDR_RE.match(addr)
+    if m:
+        return Addr(
+            m.group("line1").strip(),
+            (m.group("line2") or "").strip(),
+            m.group("city").strip(),
+            m.group("state"),
+            m.group("zip") or "",
+        )
+    # parts are stripped here once; the branches below rely on that.
     parts = [p.strip() for p in addr.split(",")]
     r = {"line1": "", "line2": "", "city": "", "state": "", "zip": ""}
     if len(parts) >= 3:
-        last = parts[-1].strip().split()
+        last = parts[-1].split()
         if len(last) >= 2 and (last[-1].isdigit() or len(last[-1]) >= 5):
             r["state"], r["zip"] = last[0], last[-1]
         elif len(last) == 1 and last[0].isdigit():
             r["zip"] = last[0]
         else:
-            r["state"] = parts[-1].strip()
-        r["city"] = parts[-2].strip()
-        r["line1"] = parts[0].strip()
+            r["state"] = parts[-1]
+        r["city"] = parts[-2]
+        r["line1"] = parts[0]
         if len(parts) > 3:
+            # The strip matters: an empty trailing segment ("St,, Denver")
+            # leaves the join with dangling whitespace.
             r["line2"] = ", ".join(parts[1:-2]).strip()
     elif len(parts) == 2:
-        r["line1"] = parts[0].strip()
-        last = parts[1].strip().split()
+        r["line1"] = parts[0]
+        last = parts[1].split()
         if len(last) >= 3:
             r["zip"], r["state"] = last[-1], last[-2]
             r["city"] = " ".join(last[:-2])
         else:
-            r["city"] = parts[1].strip()
+            r["city"] = parts[1]
     else:
         r["line1"] = addr
-    return r
+    return Addr(**r)
 
-def _al1(a): return _parse_address(a)["line1"]
-def _al2(a): return _parse_address(a)["line2"]
-def _aci(a): return _parse_address(a)["city"]
-def _ast(a): return _parse_address(a)["state"]
-def _azp(a): return _parse_address(a)["zip"]
+def _al1(a): return _parse_address(a).line1
+def _al2(a): return _parse_address(a).line2
+def _aci(a): return _parse_address(a).city
+def _ast(a): return _parse_address(a).state
+def _azp(a): return _parse_address(a).zip
 
 
 # ── Money Formatter ─────────────────────────────────────────────────
-def _fm(val):
-    if val is None or val == "":
-        return ""
+# Pre-formatted strings for the canonical limit amounts that dominate
+# real binders, so the common case is a single dict hit.
+_FM_FAST = {n: f"{n:,}" for n in (
+    5_000, 10_000, 25_000, 50_000, 100_000, 300_000, 500_000,
+    1_000_000, 2_000_000, 3_000_000, 4_000_000, 5_000_000, 10_000_000,
+)}
+
+
+def _fm_uncached(val):
     # If the extraction explicitly says "Excluded"
     if isinstance(val, str) and val.lower() in ("excluded", "excl", "n/a"):
         return "Excluded"
@@ -181,64 +240,221 @@ def _fm(val):
         return str(val)
 
 
-# ── Data Accessors ──────────────────────────────────────────────────
-def _carrier(d, letter):
-    for c in d.get("carriers", []):
-        if c.get("letter", "").upper() == letter.upper():
-            return c.get("name", "")
-    return ""
+_fm_cached = lru_cache(maxsize=4096)(_fm_uncached)
 
-def _carrier_naic(d, letter):
-    for c in d.get("carriers", []):
-        if c.get("letter", "").upper() == letter.upper():
-            naic = c.get("naic", "")
-            if naic:
-                return naic
-            name = c.get("name", "")
-            return NAIC_CODES.get(name, "")
-    return ""
+
+def _fm(val):
+    if val is None or val == "":
+        return ""
+    try:
+        fast = _FM_FAST.get(val)
+        if fast is not None:
+            return fast
+        return _fm_cached(val)
+    except TypeError:  # unhashable input — format without caching
+        return _fm_uncached(val)
+
+
+# ── Fill Context ────────────────────────────────────────────────────
+@dataclass(slots=True)
+class FillCtx:
+    """Per-document fill context.
+
+    Binds the subtrees and parsed addresses that the field tables read
+    repeatedly, so each is resolved once per document instead of once
+    per field lambda.
+    """
+    d: dict
+    today: str
+    producer: dict
+    insured: dict
+    cert_holder: dict
+    a25: dict
+    a27: dict
+    a30: dict
+    a30_gl: dict
+    a30_gk: dict
+    a30_cgl: dict
+    a30_umb: dict
+    a30_wc: dict
+    a30_endo: dict
+    a30_ch: dict
+    gl: dict
+    gl_limits: dict
+    auto: dict
+    um: dict
+    wc: dict
+    carriers_by_letter: dict
+    producer_addr: Addr
+    insured_addr: Addr
+    cert_holder_addr: Addr
+    mortgagee_addr: Addr
+    a30_ch_addr: Addr
+    property_addr_str: str
+    property_addr: Addr
+    auto_type_lc: str
+    um_type_lc: str
+    cause_lc: str
+    has_gl: bool
+    has_auto: bool
+    has_a30_garage: bool
+    has_a30_cgl: bool
+    has_a30_umbrella: bool
+    has_a30_wc: bool
+    has_umbrella: bool
+    has_wc: bool
+    gl_claims_made: bool
+    gl_occurrence: bool
+    um_has_occurrence: bool
+    um_has_retention: bool
+    wc_statutory: bool
+    a27_has_mortgagee: bool
+
+
+
+def _fm_fast(val):
+    # The optional ACORD 30 coverage sections are usually absent, so the
+    # empty miss costs one comparison and nothing else. Non-empty values
+    # share _fm's caches; 0 still renders as "Excluded".
+    if val is None or val == "":
+        return ""
+    try:
+        return _FM_FAST.get(val) or _fm_cached(val)
+    except TypeError:  # unhashable input — format without caching
+        return _fm_uncached(val)
+
+def _subdict(v):
+    """Coerce a subtree to a dict: LLM extractions drift types (null,
+    "N/A", a bare string) and every consumer here expects .get()."""
+    return v if isinstance(v, dict) else {}
+
+
+def _substr(v):
+    """Coerce a leaf expected to be a string; anything else reads ""."""
+    return v if isinstance(v, str) else ""
+
+
+def build_ctx(d: dict) -> FillCtx:
+    """Precompute everything the field lambdas read from one document."""
+    a25 = _subdict(d.get("acord25"))
+    carriers = d.get("carriers")
+    carriers_by_letter = {}
+    for c in carriers if isinstance(carriers, list) else []:
+        if not isinstance(c, dict):
+            continue
+        # first occurrence wins, matching the old linear scan
+        carriers_by_letter.setdefault((c.get("letter") or "").upper(), c)
+    gl = _subdict(a25.get("gl"))
+    limits = _subdict(gl.get("limits"))
+    a27 = _subdict(d.get("acord27"))
+
+    def _fmt_money(sub):
+        # Shallow copy with numeric values pre-formatted, so the per-field
+        # accessors are plain dict reads with no isinstance branch. The
+        # source document is left untouched.
+        return {k: (_fm(v) if isinstance(v, (int, float)) else v) for k, v in _subdict(sub).items()}
+
+    producer = _subdict(d.get("producer"))
+    insured = _subdict(d.get("insured"))
+    cert_holder = _subdict(a25.get("certificateHolder"))
+    auto = _fmt_money(a25.get("auto"))
+    um = _fmt_money(a25.get("umbrella"))
+    wc = _fmt_money(a25.get("workersComp"))
+
+    # ACORD 30 data may arrive under the legacy "acord28" key (see the
+    # note above ACORD30_FIELDS); resolve the chain and subtrees once.
+    a30 = _subdict(d.get("acord30")) or _subdict(d.get("acord28"))
+    a30_gl_sub = _subdict(a30.get("garageLiability"))
+    a30_cgl = _subdict(a30.get("commercialGL"))
+    a30_umb = _fmt_money(a30.get("umbrella"))
+    a30_wc = _fmt_money(a30.get("workersComp"))
+    a30_ch = _subdict(a30.get("certificateHolder"))
+
+    return FillCtx(
+        d=d,
+        today=datetime.now().strftime("%m/%d/%Y"),
+        producer=producer,
+        insured=insured,
+        cert_holder=cert_holder,
+        a25=a25,
+        a27=a27,
+        a30=a30,
+        a30_gl=a30_gl_sub,
+        a30_gk=_subdict(a30.get("garageKeepers")),
+        a30_cgl=a30_cgl,
+        a30_umb=a30_umb,
+        a30_wc=a30_wc,
+        a30_endo=_subdict(a30.get("endorsements")),
+        a30_ch=a30_ch,
+        gl=gl,
+        gl_limits=limits,
+        auto=auto,
+        um=um,
+        wc=wc,
+        carriers_by_letter=carriers_by_letter,
+        producer_addr=_parse_address(_substr(producer.get("address"))),
+        insured_addr=_parse_address(_substr(insured.get("address"))),
+        cert_holder_addr=_parse_address(_substr(cert_holder.get("address"))),
+        mortgagee_addr=_parse_address(_substr(_subdict(a27.get("mortgageholder")).get("address"))),
+        a30_ch_addr=_parse_address(_substr(a30_ch.get("address"))),
+        property_addr_str=a27.get("propertyAddress", ""),
+        property_addr=_parse_address(_substr(a27.get("propertyAddress"))),
+        auto_type_lc=str(auto.get("autoType", "")).lower(),
+        um_type_lc=str(um.get("type", "")).lower(),
+        cause_lc=str(a27.get("causeOfLoss", "")).lower(),
+        has_gl=bool(gl.get("policyNumber", "") or _fm(limits.get("eachOccurrence")) or _fm(limits.get("generalAggregate"))),
+        has_auto=bool(auto.get("policyNumber", "") or auto.get("combinedSingleLimit", "")),
+        has_umbrella=bool(um.get("policyNumber", "") or um.get("eachOccurrence", "")),
+        has_wc=bool(wc.get("policyNumber", "") or wc.get("eachAccident", "")),
+        has_a30_garage=bool(a30.get("policyNumber", "") or a30_gl_sub.get("autoOnlyEachAccident")),
+        has_a30_cgl=bool(a30_cgl.get("included") or a30_cgl.get("eachOccurrence") or a30_cgl.get("generalAggregate")),
+        has_a30_umbrella=bool(a30_umb.get("policyNumber", "") or a30_umb.get("eachOccurrence", "")),
+        has_a30_wc=bool(a30_wc.get("policyNumber", "") or a30_wc.get("eachAccident", "")),
+        gl_claims_made=bool(gl.get("claimsMade")),
+        gl_occurrence=bool(gl.get("occurrence")),
+        um_has_occurrence=bool(um.get("eachOccurrence", "")),
+        um_has_retention=bool(um.get("retention", "")),
+        wc_statutory=bool(wc.get("eachAccident", "")),
+        a27_has_mortgagee=bool(_subdict(a27.get("mortgageholder")).get("name", "")),
+    )
+
+
+# ── Data Accessors ──────────────────────────────────────────────────
+# Letters are normalized to uppercase once when carriers_by_letter is
+# built; callers pass already-uppercase letters.
+def _carrier(ctx, letter):
+    return ctx.carriers_by_letter.get(letter, {}).get("name", "")
+
+def _carrier_naic(ctx, letter):
+    c = ctx.carriers_by_letter.get(letter)
+    if c is None:
+        return ""
+    return c.get("naic", "") or _NAIC_CODES_CF.get((c.get("name") or "").casefold(), "")
 
 # ACORD 25 accessors
-def _a25(d, k): return (d.get("acord25") or {}).get(k, "")
-def _a25e(d, k): return (d.get("acord25") or {}).get("endorsements", {}).get(k, False)
-def _gl(d, k): return (d.get("acord25") or {}).get("gl", {}).get(k, "")
-def _glL(d, k): return _fm((d.get("acord25") or {}).get("gl", {}).get("limits", {}).get(k))
-def _au(d, k):
-    v = (d.get("acord25") or {}).get("auto", {}).get(k, "")
-    return _fm(v) if isinstance(v, (int, float)) else v
-def _um(d, k):
-    v = (d.get("acord25") or {}).get("umbrella", {}).get(k, "")
-    return _fm(v) if isinstance(v, (int, float)) else v
-def _wc(d, k):
-    v = (d.get("acord25") or {}).get("workersComp", {}).get(k, "")
-    return _fm(v) if isinstance(v, (int, float)) else v
-
-# Coverage existence helpers
-def _has_gl(d):
-    return bool(_gl(d, "policyNumber") or _glL(d, "eachOccurrence") or _glL(d, "generalAggregate"))
-
-def _has_auto(d):
-    return bool(_au(d, "policyNumber") or _au(d, "combinedSingleLimit"))
-
-def _has_umbrella(d):
-    return bool(_um(d, "policyNumber") or _um(d, "eachOccurrence"))
-
-def _has_wc(d):
-    return bool(_wc(d, "policyNumber") or _wc(d, "eachAccident"))
+def _a25(ctx, k): return ctx.a25.get(k, "")
+def _a25e(ctx, k): return _subdict(ctx.a25.get("endorsements")).get(k, False)
+def _gl(ctx, k): return ctx.gl.get(k, "")
+def _glL(ctx, k): return _fm(ctx.gl_limits.get(k))
+# auto/umbrella/workersComp subtrees have money fields pre-formatted in
+# build_ctx, so these are plain reads.
+def _au(ctx, k): return ctx.auto.get(k, "")
+def _um(ctx, k): return ctx.um.get(k, "")
+def _wc(ctx, k): return ctx.wc.get(k, "")
 
 # ACORD 27 accessors
-def _a27(d, k): return (d.get("acord27") or {}).get(k, "")
-def _a27c(d, k): return (d.get("acord27") or {}).get("coverages", {}).get(k)
-def _a27m(d, k): return (d.get("acord27") or {}).get("mortgageholder", {}).get(k, "")
+def _a27(ctx, k): return ctx.a27.get(k, "")
+def _a27c(ctx, k): return _subdict(ctx.a27.get("coverages")).get(k)
+def _a27m(ctx, k): return _subdict(ctx.a27.get("mortgageholder")).get(k, "")
 
 # ACORD 28 accessors
-def _a28(d, k): return (d.get("acord28") or {}).get(k, "")
-def _a28p(d, i, k):
-    prems = (d.get("acord28") or {}).get("premises", [])
+def _a28(ctx, k): return _subdict(ctx.d.get("acord28")).get(k, "")
+def _a28p(ctx, i, k):
+    prems = _subdict(ctx.d.get("acord28")).get("premises", [])
     return prems[i].get(k, "") if i < len(prems) else ""
-def _a28ac(d, k): return (d.get("acord28") or {}).get("additionalCoverages", {}).get(k)
-def _a28mh(d, i, k):
-    mhs = (d.get("acord28") or {}).get("mortgageholders", [])
+def _a28ac(ctx, k): return _subdict(_subdict(ctx.d.get("acord28")).get("additionalCoverages")).get(k)
+def _a28mh(ctx, i, k):
+    mhs = _subdict(ctx.d.get("acord28")).get("mortgageholders", [])
     return mhs[i].get(k, "") if i < len(mhs) else ""
 
 
@@ -247,280 +463,286 @@ def _a28mh(d, i, k):
 # ═════════════════════════════════════════════════════════════════════
 ACORD25_FIELDS = {
     # ── Header ──────────────────────────────────────────────────────
-    "Form_CompletionDate_A":                         lambda d: datetime.now().strftime("%m/%d/%Y"),
-    "CertificateOfInsurance_CertificateNumberIdentifier_A": lambda d: _a25(d, "certificateNumber"),
-    "CertificateOfInsurance_RevisionNumberIdentifier_A":    lambda d: "",
+    "Form_CompletionDate_A":                         attrgetter("today"),
+    "CertificateOfInsurance_CertificateNumberIdentifier_A": lambda ctx: _a25(ctx, "certificateNumber"),
+    "CertificateOfInsurance_RevisionNumberIdentifier_A":    "",
 
     # ── Producer ────────────────────────────────────────────────────
-    "Producer_FullName_A":                           lambda d: d.get("producer", {}).get("name", ""),
-    "Producer_MailingAddress_LineOne_A":              lambda d: _al1(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_LineTwo_A":              lambda d: _al2(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_CityName_A":             lambda d: _aci(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_StateOrProvinceCode_A":  lambda d: _ast(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_PostalCode_A":           lambda d: _azp(d.get("producer", {}).get("address", "")),
-    "Producer_ContactPerson_FullName_A":              lambda d: d.get("producer", {}).get("contactName", ""),
-    "Producer_ContactPerson_PhoneNumber_A":           lambda d: d.get("producer", {}).get("phone", ""),
-    "Producer_FaxNumber_A":                           lambda d: d.get("producer", {}).get("fax", ""),
-    "Producer_ContactPerson_EmailAddress_A":          lambda d: d.get("producer", {}).get("email", ""),
-    "Producer_AuthorizedRepresentative_Signature_A":  lambda d: "",
+    "Producer_FullName_A":                           lambda ctx: ctx.producer.get("name", ""),
+    "Producer_MailingAddress_LineOne_A":              lambda ctx: ctx.producer_addr.line1,
+    "Producer_MailingAddress_LineTwo_A":              lambda ctx: ctx.producer_addr.line2,
+    "Producer_MailingAddress_CityName_A":             lambda ctx: ctx.producer_addr.city,
+    "Producer_MailingAddress_StateOrProvinceCode_A":  lambda ctx: ctx.producer_addr.state,
+    "Producer_MailingAddress_PostalCode_A":           lambda ctx: ctx.producer_addr.zip,
+    "Producer_ContactPerson_FullName_A":              lambda ctx: ctx.producer.get("contactName", ""),
+    "Producer_ContactPerson_PhoneNumber_A":           lambda ctx: ctx.producer.get("phone", ""),
+    "Producer_FaxNumber_A":                           lambda ctx: ctx.producer.get("fax", ""),
+    "Producer_ContactPerson_EmailAddress_A":          lambda ctx: ctx.producer.get("email", ""),
+    "Producer_AuthorizedRepresentative_Signature_A":  "",
 
     # ── Insured ─────────────────────────────────────────────────────
-    "NamedInsured_FullName_A":                       lambda d: d.get("insured", {}).get("name", ""),
-    "NamedInsured_MailingAddress_LineOne_A":          lambda d: _al1(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_LineTwo_A":          lambda d: _al2(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_CityName_A":         lambda d: _aci(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_StateOrProvinceCode_A": lambda d: _ast(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_PostalCode_A":       lambda d: _azp(d.get("insured", {}).get("address", "")),
+    "NamedInsured_FullName_A":                       lambda ctx: ctx.insured.get("name", ""),
+    "NamedInsured_MailingAddress_LineOne_A":          lambda ctx: ctx.insured_addr.line1,
+    "NamedInsured_MailingAddress_LineTwo_A":          lambda ctx: ctx.insured_addr.line2,
+    "NamedInsured_MailingAddress_CityName_A":         lambda ctx: ctx.insured_addr.city,
+    "NamedInsured_MailingAddress_StateOrProvinceCode_A": lambda ctx: ctx.insured_addr.state,
+    "NamedInsured_MailingAddress_PostalCode_A":       lambda ctx: ctx.insured_addr.zip,
 
     # ── Carriers A–F ────────────────────────────────────────────────
-    "Insurer_FullName_A": lambda d: _carrier(d, "A"),
-    "Insurer_NAICCode_A": lambda d: _carrier_naic(d, "A"),
-    "Insurer_FullName_B": lambda d: _carrier(d, "B"),
-    "Insurer_NAICCode_B": lambda d: _carrier_naic(d, "B"),
-    "Insurer_FullName_C": lambda d: _carrier(d, "C"),
-    "Insurer_NAICCode_C": lambda d: _carrier_naic(d, "C"),
-    "Insurer_FullName_D": lambda d: _carrier(d, "D"),
-    "Insurer_NAICCode_D": lambda d: _carrier_naic(d, "D"),
-    "Insurer_FullName_E": lambda d: _carrier(d, "E"),
-    "Insurer_NAICCode_E": lambda d: _carrier_naic(d, "E"),
-    "Insurer_FullName_F": lambda d: _carrier(d, "F"),
-    "Insurer_NAICCode_F": lambda d: _carrier_naic(d, "F"),
+    "Insurer_FullName_A": lambda ctx: _carrier(ctx, "A"),
+    "Insurer_NAICCode_A": lambda ctx: _carrier_naic(ctx, "A"),
+    "Insurer_FullName_B": lambda ctx: _carrier(ctx, "B"),
+    "Insurer_NAICCode_B": lambda ctx: _carrier_naic(ctx, "B"),
+    "Insurer_FullName_C": lambda ctx: _carrier(ctx, "C"),
+    "Insurer_NAICCode_C": lambda ctx: _carrier_naic(ctx, "C"),
+    "Insurer_FullName_D": lambda ctx: _carrier(ctx, "D"),
+    "Insurer_NAICCode_D": lambda ctx: _carrier_naic(ctx, "D"),
+    "Insurer_FullName_E": lambda ctx: _carrier(ctx, "E"),
+    "Insurer_NAICCode_E": lambda ctx: _carrier_naic(ctx, "E"),
+    "Insurer_FullName_F": lambda ctx: _carrier(ctx, "F"),
+    "Insurer_NAICCode_F": lambda ctx: _carrier_naic(ctx, "F"),
 
     # ── General Liability ───────────────────────────────────────────
-    "GeneralLiability_InsurerLetterCode_A":          lambda d: _gl(d, "insurerLetter") or ("A" if _has_gl(d) else ""),
-    "Policy_GeneralLiability_PolicyNumberIdentifier_A": lambda d: _gl(d, "policyNumber"),
-    "Policy_GeneralLiability_EffectiveDate_A":       lambda d: _gl(d, "effectiveDate"),
-    "Policy_GeneralLiability_ExpirationDate_A":      lambda d: _gl(d, "expirationDate"),
-
-    "GeneralLiability_CoverageIndicator_A":          lambda d: _has_gl(d),
-    "GeneralLiability_ClaimsMadeIndicator_A":        lambda d: bool(_gl(d, "claimsMade")),
-    "GeneralLiability_OccurrenceIndicator_A":        lambda d: bool(_gl(d, "occurrence")),
-
-    "GeneralLiability_EachOccurrence_LimitAmount_A":                         lambda d: _glL(d, "eachOccurrence"),
-    "GeneralLiability_FireDamageRentedPremises_EachOccurrenceLimitAmount_A":  lambda d: _glL(d, "damageToRentedPremises"),
-    "GeneralLiability_MedicalExpense_EachPersonLimitAmount_A":               lambda d: _glL(d, "medicalExpense"),
-    "GeneralLiability_PersonalAndAdvertisingInjury_LimitAmount_A":           lambda d: _glL(d, "personalAdvInjury"),
-    "GeneralLiability_GeneralAggregate_LimitAmount_A":                       lambda d: _glL(d, "generalAggregate"),
-    "GeneralLiability_ProductsAndCompletedOperations_AggregateLimitAmount_A": lambda d: _glL(d, "productsCompOp"),
-
-    "GeneralLiability_GeneralAggregate_LimitAppliesPerPolicyIndicator_A":   lambda d: _has_gl(d),
-    "GeneralLiability_GeneralAggregate_LimitAppliesPerProjectIndicator_A":  lambda d: False,
-    "GeneralLiability_GeneralAggregate_LimitAppliesPerLocationIndicator_A": lambda d: False,
-    "GeneralLiability_GeneralAggregate_LimitAppliesToOtherIndicator_A":     lambda d: False,
-    "GeneralLiability_GeneralAggregate_LimitAppliesToCode_A":               lambda d: "",
-
-    "GeneralLiability_OtherCoverageIndicator_A":     lambda d: False,
-    "GeneralLiability_OtherCoverageIndicator_B":     lambda d: False,
-    "GeneralLiability_OtherCoverageDescription_A":   lambda d: "",
-    "GeneralLiability_OtherCoverageDescription_B":   lambda d: "",
-    "GeneralLiability_OtherCoverageLimitAmount_A":   lambda d: "",
-    "GeneralLiability_OtherCoverageLimitDescription_A": lambda d: "",
+    "GeneralLiability_InsurerLetterCode_A":          lambda ctx: _gl(ctx, "insurerLetter") or ("A" if ctx.has_gl else ""),
+    "Policy_GeneralLiability_PolicyNumberIdentifier_A": lambda ctx: _gl(ctx, "policyNumber"),
+    "Policy_GeneralLiability_EffectiveDate_A":       lambda ctx: _gl(ctx, "effectiveDate"),
+    "Policy_GeneralLiability_ExpirationDate_A":      lambda ctx: _gl(ctx, "expirationDate"),
+
+    "GeneralLiability_CoverageIndicator_A":          lambda ctx: ctx.has_gl,
+    "GeneralLiability_ClaimsMadeIndicator_A":        attrgetter("gl_claims_made"),
+    "GeneralLiability_OccurrenceIndicator_A":        attrgetter("gl_occurrence"),
+
+    "GeneralLiability_EachOccurrence_LimitAmount_A":                         lambda ctx: _glL(ctx, "eachOccurrence"),
+    "GeneralLiability_FireDamageRentedPremises_EachOccurrenceLimitAmount_A":  lambda ctx: _glL(ctx, "damageToRentedPremises"),
+    "GeneralLiability_MedicalExpense_EachPersonLimitAmount_A":               lambda ctx: _glL(ctx, "medicalExpense"),
+    "GeneralLiability_PersonalAndAdvertisingInjury_LimitAmount_A":           lambda ctx: _glL(ctx, "personalAdvInjury"),
+    "GeneralLiability_GeneralAggregate_LimitAmount_A":                       lambda ctx: _glL(ctx, "generalAggregate"),
+    "GeneralLiability_ProductsAndCompletedOperations_AggregateLimitAmount_A": lambda ctx: _glL(ctx, "productsCompOp"),
+
+    "GeneralLiability_GeneralAggregate_LimitAppliesPerPolicyIndicator_A":   lambda ctx: ctx.has_gl,
+    "GeneralLiability_GeneralAggregate_LimitAppliesPerProjectIndicator_A":  False,
+    "GeneralLiability_GeneralAggregate_LimitAppliesPerLocationIndicator_A": False,
+    "GeneralLiability_GeneralAggregate_LimitAppliesToOtherIndicator_A":     False,
+    "GeneralLiability_GeneralAggregate_LimitAppliesToCode_A":               "",
+
+    "GeneralLiability_OtherCoverageIndicator_A":     False,
+    "GeneralLiability_OtherCoverageIndicator_B":     False,
+    "GeneralLiability_OtherCoverageDescription_A":   "",
+    "GeneralLiability_OtherCoverageDescription_B":   "",
+    "GeneralLiability_OtherCoverageLimitAmount_A":   "",
+    "GeneralLiability_OtherCoverageLimitDescription_A": "",
 
     # GL endorsements
-    "CertificateOfInsurance_GeneralLiability_AdditionalInsuredCode_A": lambda d: "Y" if _gl(d, "policyNumber") and _a25e(d, "additionalInsured") else "",
-    "Policy_GeneralLiability_SubrogationWaivedCode_A":                 lambda d: "Y" if _gl(d, "policyNumber") and _a25e(d, "waiverOfSubrogation") else "",
+    "CertificateOfInsurance_GeneralLiability_AdditionalInsuredCode_A": lambda ctx: "Y" if _gl(ctx, "policyNumber") and _a25e(ctx, "additionalInsured") else "",
+    "Policy_GeneralLiability_SubrogationWaivedCode_A":                 lambda ctx: "Y" if _gl(ctx, "policyNumber") and _a25e(ctx, "waiverOfSubrogation") else "",
 
     # ── Automobile Liability ────────────────────────────────────────
-    "Vehicle_InsurerLetterCode_A":                       lambda d: _au(d, "insurerLetter") or ("A" if _has_auto(d) else ""),
-    "Policy_AutomobileLiability_PolicyNumberIdentifier_A": lambda d: _au(d, "policyNumber"),
-    "Policy_AutomobileLiability_EffectiveDate_A":        lambda d: _au(d, "effectiveDate"),
-    "Policy_AutomobileLiability_ExpirationDate_A":       lambda d: _au(d, "expirationDate"),
-
-    "Vehicle_AnyAutoIndicator_A":         lambda d: str(_au(d, "autoType")).lower() in ("any auto", "any"),
-    "Vehicle_AllOwnedAutosIndicator_A":   lambda d: "owned" in str(_au(d, "autoType")).lower(),
-    "Vehicle_ScheduledAutosIndicator_A":  lambda d: "scheduled" in str(_au(d, "autoType")).lower(),
-    "Vehicle_HiredAutosIndicator_A":      lambda d: "hired" in str(_au(d, "autoType")).lower(),
-    "Vehicle_NonOwnedAutosIndicator_A":   lambda d: "non-owned" in str(_au(d, "autoType")).lower() or "non owned" in str(_au(d, "autoType")).lower(),
-    "Vehicle_OtherCoveredAutoIndicator_A": lambda d: False,
-    "Vehicle_OtherCoveredAutoIndicator_B": lambda d: False,
-    "Vehicle_OtherCoveredAutoDescription_A": lambda d: "",
-    "Vehicle_OtherCoveredAutoDescription_B": lambda d: "",
-
-    "Vehicle_CombinedSingleLimit_EachAccidentAmount_A": lambda d: _fm(_au(d, "combinedSingleLimit")),
-    "Vehicle_BodilyInjury_PerPersonLimitAmount_A":      lambda d: "",
-    "Vehicle_BodilyInjury_PerAccidentLimitAmount_A":    lambda d: "",
-    "Vehicle_PropertyDamage_PerAccidentLimitAmount_A":  lambda d: "",
-    "Vehicle_OtherCoverage_CoverageDescription_A":      lambda d: "",
-    "Vehicle_OtherCoverage_LimitAmount_A":              lambda d: "",
-
-    "CertificateOfInsurance_AutomobileLiability_AdditionalInsuredCode_A": lambda d: "Y" if _au(d, "policyNumber") and _a25e(d, "additionalInsured") else "",
-    "Policy_AutomobileLiability_SubrogationWaivedCode_A":                 lambda d: "Y" if _au(d, "policyNumber") and _a25e(d, "waiverOfSubrogation") else "",
+    "Vehicle_InsurerLetterCode_A":                       lambda ctx: _au(ctx, "insurerLetter") or ("A" if ctx.has_auto else ""),
+    "Policy_AutomobileLiability_PolicyNumberIdentifier_A": lambda ctx: _au(ctx, "policyNumber"),
+    "Policy_AutomobileLiability_EffectiveDate_A":        lambda ctx: _au(ctx, "effectiveDate"),
+    "Policy_AutomobileLiability_ExpirationDate_A":       lambda ctx: _au(ctx, "expirationDate"),
+
+    "Vehicle_AnyAutoIndicator_A":         lambda ctx: ctx.auto_type_lc in ("any auto", "any"),
+    "Vehicle_AllOwnedAutosIndicator_A":   lambda ctx: "owned" in ctx.auto_type_lc,
+    "Vehicle_ScheduledAutosIndicator_A":  lambda ctx: "scheduled" in ctx.auto_type_lc,
+    "Vehicle_HiredAutosIndicator_A":      lambda ctx: "hired" in ctx.auto_type_lc,
+    "Vehicle_NonOwnedAutosIndicator_A":   lambda ctx: "non-owned" in ctx.auto_type_lc or "non owned" in ctx.auto_type_lc,
+    "Vehicle_OtherCoveredAutoIndicator_A": False,
+    "Vehicle_OtherCoveredAutoIndicator_B": False,
+    "Vehicle_OtherCoveredAutoDescription_A": "",
+    "Vehicle_OtherCoveredAutoDescription_B": "",
+
+    "Vehicle_CombinedSingleLimit_EachAccidentAmount_A": lambda ctx: _fm(_au(ctx, "combinedSingleLimit")),
+    "Vehicle_BodilyInjury_PerPersonLimitAmount_A":      "",
+    "Vehicle_BodilyInjury_PerAccidentLimitAmount_A":    "",
+    "Vehicle_PropertyDamage_PerAccidentLimitAmount_A":  "",
+    "Vehicle_OtherCoverage_CoverageDescription_A":      "",
+    "Vehicle_OtherCoverage_LimitAmount_A":              "",
+
+    "CertificateOfInsurance_AutomobileLiability_AdditionalInsuredCode_A": lambda ctx: "Y" if _au(ctx, "policyNumber") and _a25e(ctx, "additionalInsured") else "",
+    "Policy_AutomobileLiability_SubrogationWaivedCode_A":                 lambda ctx: "Y" if _au(ctx, "policyNumber") and _a25e(ctx, "waiverOfSubrogation") else "",
 
     # ── Umbrella / Excess ───────────────────────────────────────────
-    "ExcessUmbrella_InsurerLetterCode_A":            lambda d: _um(d, "insurerLetter") or ("A" if _has_umbrella(d) else ""),
-    "Policy_ExcessLiability_PolicyNumberIdentifier_A": lambda d: _um(d, "policyNumber"),
-    "Policy_ExcessLiability_EffectiveDate_A":        lambda d: _um(d, "effectiveDate"),
-    "Policy_ExcessLiability_ExpirationDate_A":       lambda d: _um(d, "expirationDate"),
-
-    "Policy_PolicyType_UmbrellaIndicator_A": lambda d: str(_um(d, "type")).lower() in ("umbrella", ""),
-    "Policy_PolicyType_ExcessIndicator_A":   lambda d: str(_um(d, "type")).lower() == "excess",
-    "ExcessUmbrella_OccurrenceIndicator_A":  lambda d: bool(_um(d, "eachOccurrence")),
-    "ExcessUmbrella_ClaimsMadeIndicator_A":  lambda d: False,
-    "ExcessUmbrella_DeductibleIndicator_A":  lambda d: False,
-    "ExcessUmbrella_RetentionIndicator_A":   lambda d: bool(_um(d, "retention")),
-
-    "ExcessUmbrella_Umbrella_EachOccurrenceAmount_A":        lambda d: _fm(_um(d, "eachOccurrence")),
-    "ExcessUmbrella_Umbrella_AggregateAmount_A":             lambda d: _fm(_um(d, "aggregate")),
-    "ExcessUmbrella_Umbrella_DeductibleOrRetentionAmount_A": lambda d: _fm(_um(d, "retention")),
-    "ExcessUmbrella_OtherCoverageDescription_A":             lambda d: "",
-    "ExcessUmbrella_OtherCoverageLimitAmount_A":             lambda d: "",
-
-    "CertificateOfInsurance_ExcessLiability_AdditionalInsuredCode_A": lambda d: "Y" if _um(d, "policyNumber") and _a25e(d, "additionalInsured") else "",
-    "Policy_ExcessLiability_SubrogationWaivedCode_A":                 lambda d: "Y" if _um(d, "policyNumber") and _a25e(d, "waiverOfSubrogation") else "",
+    "ExcessUmbrella_InsurerLetterCode_A":            lambda ctx: _um(ctx, "insurerLetter") or ("A" if ctx.has_umbrella else ""),
+    "Policy_ExcessLiability_PolicyNumberIdentifier_A": lambda ctx: _um(ctx, "policyNumber"),
+    "Policy_ExcessLiability_EffectiveDate_A":        lambda ctx: _um(ctx, "effectiveDate"),
+    "Policy_ExcessLiability_ExpirationDate_A":       lambda ctx: _um(ctx, "expirationDate"),
+
+    "Policy_PolicyType_UmbrellaIndicator_A": lambda ctx: ctx.um_type_lc in ("umbrella", ""),
+    "Policy_PolicyType_ExcessIndicator_A":   lambda ctx: ctx.um_type_lc == "excess",
+    "ExcessUmbrella_OccurrenceIndicator_A":  attrgetter("um_has_occurrence"),
+    "ExcessUmbrella_ClaimsMadeIndicator_A":  False,
+    "ExcessUmbrella_DeductibleIndicator_A":  False,
+    "ExcessUmbrella_RetentionIndicator_A":   attrgetter("um_has_retention"),
+
+    "ExcessUmbrella_Umbrella_EachOccurrenceAmount_A":        lambda ctx: _fm(_um(ctx, "eachOccurrence")),
+    "ExcessUmbrella_Umbrella_AggregateAmount_A":             lambda ctx: _fm(_um(ctx, "aggregate")),
+    "ExcessUmbrella_Umbrella_DeductibleOrRetentionAmount_A": lambda ctx: _fm(_um(ctx, "retention")),
+    "ExcessUmbrella_OtherCoverageDescription_A":             "",
+    "ExcessUmbrella_OtherCoverageLimitAmount_A":             "",
+
+    "CertificateOfInsurance_ExcessLiability_AdditionalInsuredCode_A": lambda ctx: "Y" if _um(ctx, "policyNumber") and _a25e(ctx, "additionalInsured") else "",
+    "Policy_ExcessLiability_SubrogationWaivedCode_A":                 lambda ctx: "Y" if _um(ctx, "policyNumber") and _a25e(ctx, "waiverOfSubrogation") else "",
 
     # ── Workers Compensation ────────────────────────────────────────
-    "WorkersCompensationEmployersLiability_InsurerLetterCode_A":    lambda d: _wc(d, "insurerLetter") or ("A" if _has_wc(d) else ""),
-    "Policy_WorkersCompensationAndEmployersLiability_PolicyNumberIdentifier_A": lambda d: _wc(d, "policyNumber"),
-    "Policy_WorkersCompensationAndEmployersLiability_EffectiveDate_A":         lambda d: _wc(d, "effectiveDate"),
-    "Policy_WorkersCompensationAndEmployersLiability_ExpirationDate_A":        lambda d: _wc(d, "expirationDate"),
+    "WorkersCompensationEmployersLiability_InsurerLetterCode_A":    lambda ctx: _wc(ctx, "insurerLetter") or ("A" if ctx.has_wc else ""),
+    "Policy_WorkersCompensationAndEmployersLiability_PolicyNumberIdentifier_A": lambda ctx: _wc(ctx, "policyNumber"),
+    "Policy_WorkersCompensationAndEmployersLiability_EffectiveDate_A":         lambda ctx: _wc(ctx, "effectiveDate"),
+    "Policy_WorkersCompensationAndEmployersLiability_ExpirationDate_A":        lambda ctx: _wc(ctx, "expirationDate"),
 
-    "WorkersCompensationEmployersLiability_WorkersCompensationStatutoryLimitIndicator_A": lambda d: bool(_wc(d, "eachAccident")),
-    "WorkersCompensationEmployersLiability_OtherCoverageIndicator_A":    lambda d: False,
-    "WorkersCompensationEmployersLiability_OtherCoverageDescription_A":  lambda d: "",
-    "WorkersCompensationEmployersLiability_AnyPersonsExcludedIndicator_A": lambda d: "",
+    "WorkersCompensationEmployersLiability_WorkersCompensationStatutoryLimitIndicator_A": attrgetter("wc_statutory"),
+    "WorkersCompensationEmployersLiability_OtherCoverageIndicator_A":    False,
+    "WorkersCompensationEmployersLiability_OtherCoverageDescription_A":  "",
+    "WorkersCompensationEmployersLiability_AnyPersonsExcludedIndicator_A": "",
 
-    "WorkersCompensationEmployersLiability_EmployersLiability_EachAccidentLimitAmount_A":       lambda d: _fm(_wc(d, "eachAccident")),
-    "WorkersCompensationEmployersLiability_EmployersLiability_DiseaseEachEmployeeLimitAmount_A": lambda d: _fm(_wc(d, "diseaseEachEmployee")),
-    "WorkersCompensationEmployersLiability_EmployersLiability_DiseasePolicyLimitAmount_A":      lambda d: _fm(_wc(d, "diseasePolicyLimit")),
+    "WorkersCompensationEmployersLiability_EmployersLiability_EachAccidentLimitAmount_A":       lambda ctx: _fm(_wc(ctx, "eachAccident")),
+    "WorkersCompensationEmployersLiability_EmployersLiability_DiseaseEachEmployeeLimitAmount_A": lambda ctx: _fm(_wc(ctx, "diseaseEachEmployee")),
+    "WorkersCompensationEmployersLiability_EmployersLiability_DiseasePolicyLimitAmount_A":      lambda ctx: _fm(_wc(ctx, "diseasePolicyLimit")),
 
-    "Policy_WorkersCompensation_SubrogationWaivedCode_A": lambda d: "Y" if _wc(d, "policyNumber") and _a25e(d, "waiverOfSubrogation") else "",
+    "Policy_WorkersCompensation_SubrogationWaivedCode_A": lambda ctx: "Y" if _wc(ctx, "policyNumber") and _a25e(ctx, "waiverOfSubrogation") else "",
 
     # ── Other Policy (blank) ────────────────────────────────────────
-    "OtherPolicy_InsurerLetterCode_A":       lambda d: "",
-    "OtherPolicy_OtherPolicyDescription_A":  lambda d: "",
-    "OtherPolicy_PolicyNumberIdentifier_A":  lambda d: "",
-    "OtherPolicy_PolicyEffectiveDate_A":     lambda d: "",
-    "OtherPolicy_PolicyExpirationDate_A":    lambda d: "",
-    "OtherPolicy_CoverageCode_A":            lambda d: "",
-    "OtherPolicy_CoverageCode_B":            lambda d: "",
-    "OtherPolicy_CoverageCode_C":            lambda d: "",
-    "OtherPolicy_CoverageLimitAmount_A":     lambda d: "",
-    "OtherPolicy_CoverageLimitAmount_B":     lambda d: "",
-    "OtherPolicy_CoverageLimitAmount_C":     lambda d: "",
-    "CertificateOfInsurance_OtherPolicy_AdditionalInsuredCode_A": lambda d: "",
-    "OtherPolicy_SubrogationWaivedCode_A":   lambda d: "",
+    "OtherPolicy_InsurerLetterCode_A":       "",
+    "OtherPolicy_OtherPolicyDescription_A":  "",
+    "OtherPolicy_PolicyNumberIdentifier_A":  "",
+    "OtherPolicy_PolicyEffectiveDate_A":     "",
+    "OtherPolicy_PolicyExpirationDate_A":    "",
+    "OtherPolicy_CoverageCode_A":            "",
+    "OtherPolicy_CoverageCode_B":            "",
+    "OtherPolicy_CoverageCode_C":            "",
+    "OtherPolicy_CoverageLimitAmount_A":     "",
+    "OtherPolicy_CoverageLimitAmount_B":     "",
+    "OtherPolicy_CoverageLimitAmount_C":     "",
+    "CertificateOfInsurance_OtherPolicy_AdditionalInsuredCode_A": "",
+    "OtherPolicy_SubrogationWaivedCode_A":   "",
 
     # ── Description of Operations ───────────────────────────────────
-    "CertificateOfLiabilityInsurance_ACORDForm_RemarkText_A": lambda d: _a25(d, "descriptionOfOperations"),
+    "CertificateOfLiabilityInsurance_ACORDForm_RemarkText_A": lambda ctx: _a25(ctx, "descriptionOfOperations"),
 
     # ── Certificate Holder ──────────────────────────────────────────
-    "CertificateHolder_FullName_A":                      lambda d: (d.get("acord25") or {}).get("certificateHolder", {}).get("name", ""),
-    "CertificateHolder_MailingAddress_LineOne_A":         lambda d: _al1((d.get("acord25") or {}).get("certificateHolder", {}).get("address", "")),
-    "CertificateHolder_MailingAddress_LineTwo_A":         lambda d: _al2((d.get("acord25") or {}).get("certificateHolder", {}).get("address", "")),
-    "CertificateHolder_MailingAddress_CityName_A":        lambda d: _aci((d.get("acord25") or {}).get("certificateHolder", {}).get("address", "")),
-    "CertificateHolder_MailingAddress_StateOrProvinceCode_A": lambda d: _ast((d.get("acord25") or {}).get("certificateHolder", {}).get("address", "")),
-    "CertificateHolder_MailingAddress_PostalCode_A":      lambda d: _azp((d.get("acord25") or {}).get("certificateHolder", {}).get("address", "")),
+    "CertificateHolder_FullName_A":                      lambda ctx: ctx.cert_holder.get("name", ""),
+    "CertificateHolder_MailingAddress_LineOne_A":         lambda ctx: ctx.cert_holder_addr.line1,
+    "CertificateHolder_MailingAddress_LineTwo_A":         lambda ctx: ctx.cert_holder_addr.line2,
+    "CertificateHolder_MailingAddress_CityName_A":        lambda ctx: ctx.cert_holder_addr.city,
+    "CertificateHolder_MailingAddress_StateOrProvinceCode_A": lambda ctx: ctx.cert_holder_addr.state,
+    "CertificateHolder_MailingAddress_PostalCode_A":      lambda ctx: ctx.cert_holder_addr.zip,
 }
 
+# Frozen iteration order: tuple iteration at fill time skips dict
+# iterator overhead; the dict stays exported for introspection.
+_ACORD25_ORDER = tuple(ACORD25_FIELDS.items())
+
 
 # ═════════════════════════════════════════════════════════════════════
 # ACORD 27 — Verified field names from PDF dump
 # ═════════════════════════════════════════════════════════════════════
 ACORD27_FIELDS = {
     # ── Header ──────────────────────────────────────────────────────
-    "Form_CompletionDate_A": lambda d: datetime.now().strftime("%m/%d/%Y"),
+    "Form_CompletionDate_A": attrgetter("today"),
 
     # ── Producer ────────────────────────────────────────────────────
-    "Producer_FullName_A":                          lambda d: d.get("producer", {}).get("name", ""),
-    "Producer_MailingAddress_LineOne_A":             lambda d: _al1(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_LineTwo_A":             lambda d: _al2(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_CityName_A":            lambda d: _aci(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_StateOrProvinceCode_A": lambda d: _ast(d.get("producer", {}).get("address", "")),
-    "Producer_MailingAddress_PostalCode_A":          lambda d: _azp(d.get("producer", {}).get("address", "")),
-    "Producer_ContactPerson_PhoneNumber_A":          lambda d: d.get("producer", {}).get("phone", ""),
-    "Producer_FaxNumber_A":                          lambda d: d.get("producer", {}).get("fax", ""),
-    "Producer_ContactPerson_EmailAddress_A":         lambda d: d.get("producer", {}).get("email", ""),
-    "Producer_CustomerIdentifier_A":                 lambda d: "",
-    "Producer_AuthorizedRepresentative_Signature_A": lambda d: "",
+    "Producer_FullName_A":                          lambda ctx: ctx.producer.get("name", ""),
+    "Producer_MailingAddress_LineOne_A":             lambda ctx: ctx.producer_addr.line1,
+    "Producer_MailingAddress_LineTwo_A":             lambda ctx: ctx.producer_addr.line2,
+    "Producer_MailingAddress_CityName_A":            lambda ctx: ctx.producer_addr.city,
+    "Producer_MailingAddress_StateOrProvinceCode_A": lambda ctx: ctx.producer_addr.state,
+    "Producer_MailingAddress_PostalCode_A":          lambda ctx: ctx.producer_addr.zip,
+    "Producer_ContactPerson_PhoneNumber_A":          lambda ctx: ctx.producer.get("phone", ""),
+    "Producer_FaxNumber_A":                          lambda ctx: ctx.producer.get("fax", ""),
+    "Producer_ContactPerson_EmailAddress_A":         lambda ctx: ctx.producer.get("email", ""),
+    "Producer_CustomerIdentifier_A":                 "",
+    "Producer_AuthorizedRepresentative_Signature_A": "",
 
     # ── Insurer (carrier) ───────────────────────────────────────────
-    "Insurer_FullName_A":                           lambda d: _carrier(d, (d.get("acord27") or {}).get("insurerLetter", "A")),
-    "Insurer_MailingAddress_AddressLineOne_A":      lambda d: "",
-    "Insurer_MailingAddress_AddressLineTwo_A":      lambda d: "",
-    "Insurer_MailingAddress_CityName_A":            lambda d: "",
-    "Insurer_MailingAddress_StateOrProvinceCode_A": lambda d: "",
-    "Insurer_MailingAddress_PostalCode_A":          lambda d: "",
-    "Insurer_ProducerIdentifier_A":                 lambda d: "",
-    "Insurer_SubProducerIdentifier_A":              lambda d: "",
+    "Insurer_FullName_A":                           lambda ctx: _carrier(ctx, (ctx.a27.get("insurerLetter") or "A").upper()),
+    "Insurer_MailingAddress_AddressLineOne_A":      "",
+    "Insurer_MailingAddress_AddressLineTwo_A":      "",
+    "Insurer_MailingAddress_CityName_A":            "",
+    "Insurer_MailingAddress_StateOrProvinceCode_A": "",
+    "Insurer_MailingAddress_PostalCode_A":          "",
+    "Insurer_ProducerIdentifier_A":                 "",
+    "Insurer_SubProducerIdentifier_A":              "",
 
     # ── Named Insured ───────────────────────────────────────────────
-    "NamedInsured_FullName_A":                          lambda d: d.get("insured", {}).get("name", ""),
-    "NamedInsured_MailingAddress_LineOne_A":             lambda d: _al1(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_LineTwo_A":             lambda d: _al2(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_CityName_A":            lambda d: _aci(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_StateOrProvinceCode_A": lambda d: _ast(d.get("insured", {}).get("address", "")),
-    "NamedInsured_MailingAddress_PostalCode_A":          lambda d: _azp(d.get("insured", {}).get("address", "")),
+    "NamedInsured_FullName_A":                          lambda ctx: ctx.insured.get("name", ""),
+    "NamedInsured_MailingAddress_LineOne_A":             lambda ctx: ctx.insured_addr.line1,
+    "NamedInsured_MailingAddress_LineTwo_A":             lambda ctx: ctx.insured_addr.line2,
+    "NamedInsured_MailingAddress_CityName_A":            lambda ctx: ctx.insured_addr.city,
+    "NamedInsured_MailingAddress_StateOrProvinceCode_A": lambda ctx: ctx.insured_addr.state,
+    "NamedInsured_MailingAddress_PostalCode_A":          lambda ctx: ctx.insured_addr.zip,
 
     # ── Policy ──────────────────────────────────────────────────────
-    "Policy_PolicyNumberIdentifier_A": lambda d: _a27(d, "policyNumber"),
-    "Policy_EffectiveDate_A":          lambda d: _a27(d, "effectiveDate"),
-    "Policy_ExpirationDate_A":         lambda d: _a27(d, "expirationDate"),
+    "Policy_PolicyNumberIdentifier_A": lambda ctx: _a27(ctx, "policyNumber"),
+    "Policy_EffectiveDate_A":          lambda ctx: _a27(ctx, "effectiveDate"),
+    "Policy_ExpirationDate_A":         lambda ctx: _a27(ctx, "expirationDate"),
 
     # ── Perils / Cause of Loss ──────────────────────────────────────
-    "Policy_PolicyType_BasicIndicator_A":   lambda d: str(_a27(d, "causeOfLoss")).lower() == "basic",
-    "Policy_PolicyType_BroadIndicator_A":   lambda d: str(_a27(d, "causeOfLoss")).lower() == "broad",
-    "Policy_PolicyType_SpecialIndicator_A": lambda d: "special" in str(_a27(d, "causeOfLoss")).lower(),
-    "Policy_PolicyType_OtherIndicator_A":   lambda d: False,
-    "Policy_PolicyType_OtherDescription_A": lambda d: "",
+    "Policy_PolicyType_BasicIndicator_A":   lambda ctx: ctx.cause_lc == "basic",
+    "Policy_PolicyType_BroadIndicator_A":   lambda ctx: ctx.cause_lc == "broad",
+    "Policy_PolicyType_SpecialIndicator_A": lambda ctx: "special" in ctx.cause_lc,
+    "Policy_PolicyType_OtherIndicator_A":   False,
+    "Policy_PolicyType_OtherDescription_A": "",
 
     # ── Property Location ───────────────────────────────────────────
-    "EvidenceOfProperty_PropertyDescription_A":                    lambda d: _a27(d, "propertyAddress"),
-    "EvidenceOfProperty_PhysicalAddress_StreetLineOne_A":          lambda d: _al1(_a27(d, "propertyAddress")),
-    "EvidenceOfProperty_PhysicalAddress_StreetLineTwo_A":          lambda d: _al2(_a27(d, "propertyAddress")),
-    "EvidenceOfProperty_PhysicalAddress_CityName_A":               lambda d: _aci(_a27(d, "propertyAddress")),
-    "EvidenceOfProperty_PhysicalAddress_StateOrProvinceCode_A":    lambda d: _ast(_a27(d, "propertyAddress")),
-    "EvidenceOfProperty_PhysicalAddress_PostalCode_A":             lambda d: _azp(_a27(d, "propertyAddress")),
-    "EvidenceOfProperty_PhysicalAddress_CountyName_A":             lambda d: "",
-    "EvidenceOfProperty_PriorEvidenceDate_A":                      lambda d: "",
-    "EvidenceOfProperty_ContinuousBasisIndicator_A":               lambda d: False,
+    "EvidenceOfProperty_PropertyDescription_A":                    lambda ctx: ctx.property_addr_str,
+    "EvidenceOfProperty_PhysicalAddress_StreetLineOne_A":          lambda ctx: ctx.property_addr.line1,
+    "EvidenceOfProperty_PhysicalAddress_StreetLineTwo_A":          lambda ctx: ctx.property_addr.line2,
+    "EvidenceOfProperty_PhysicalAddress_CityName_A":               lambda ctx: ctx.property_addr.city,
+    "EvidenceOfProperty_PhysicalAddress_StateOrProvinceCode_A":    lambda ctx: ctx.property_addr.state,
+    "EvidenceOfProperty_PhysicalAddress_PostalCode_A":             lambda ctx: ctx.property_addr.zip,
+    "EvidenceOfProperty_PhysicalAddress_CountyName_A":             "",
+    "EvidenceOfProperty_PriorEvidenceDate_A":                      "",
+    "EvidenceOfProperty_ContinuousBasisIndicator_A":               False,
 
     # ── Coverage Rows A–J ───────────────────────────────────────────
-    "EvidenceOfProperty_CoverageDescription_A": lambda d: "Building" if _a27c(d, "building") else "",
-    "EvidenceOfProperty_LimitAmount_A":         lambda d: _fm(_a27c(d, "building")),
-    "EvidenceOfProperty_DeductibleAmount_A":    lambda d: _fm(_a27(d, "deductible")),
+    "EvidenceOfProperty_CoverageDescription_A": lambda ctx: "Building" if _a27c(ctx, "building") else "",
+    "EvidenceOfProperty_LimitAmount_A":         lambda ctx: _fm(_a27c(ctx, "building")),
+    "EvidenceOfProperty_DeductibleAmount_A":    lambda ctx: _fm(_a27(ctx, "deductible")),
 
-    "EvidenceOfProperty_CoverageDescription_B": lambda d: "Business Personal Property" if _a27c(d, "personalProperty") else "",
-    "EvidenceOfProperty_LimitAmount_B":         lambda d: _fm(_a27c(d, "personalProperty")),
-    "EvidenceOfProperty_DeductibleAmount_B":    lambda d: _fm(_a27(d, "deductible")) if _a27c(d, "personalProperty") else "",
+    "EvidenceOfProperty_CoverageDescription_B": lambda ctx: "Business Personal Property" if _a27c(ctx, "personalProperty") else "",
+    "EvidenceOfProperty_LimitAmount_B":         lambda ctx: _fm(_a27c(ctx, "personalProperty")),
+    "EvidenceOfProperty_DeductibleAmount_B":    lambda ctx: _fm(_a27(ctx, "deductible")) if _a27c(ctx, "personalProperty") else "",
 
-    "EvidenceOfProperty_CoverageDescription_C": lambda d: "Business Income" if _a27c(d, "businessIncome") else "",
-    "EvidenceOfProperty_LimitAmount_C":         lambda d: _fm(_a27c(d, "businessIncome")),
-    "EvidenceOfProperty_DeductibleAmount_C":    lambda d: "",
+    "EvidenceOfProperty_CoverageDescription_C": lambda ctx: "Business Income" if _a27c(ctx, "businessIncome") else "",
+    "EvidenceOfProperty_LimitAmount_C":         lambda ctx: _fm(_a27c(ctx, "businessIncome")),
+    "EvidenceOfProperty_DeductibleAmount_C":    "",
 
-    "EvidenceOfProperty_CoverageDescription_D": lambda d: "Flood" if _a27c(d, "flood") else "",
-    "EvidenceOfProperty_LimitAmount_D":         lambda d: _fm(_a27c(d, "flood")),
-    "EvidenceOfProperty_DeductibleAmount_D":    lambda d: "",
+    "EvidenceOfProperty_CoverageDescription_D": lambda ctx: "Flood" if _a27c(ctx, "flood") else "",
+    "EvidenceOfProperty_LimitAmount_D":         lambda ctx: _fm(_a27c(ctx, "flood")),
+    "EvidenceOfProperty_DeductibleAmount_D":    "",
 
-    "EvidenceOfProperty_CoverageDescription_E": lambda d: "Earthquake" if _a27c(d, "earthquake") else "",
-    "EvidenceOfProperty_LimitAmount_E":         lambda d: _fm(_a27c(d, "earthquake")),
-    "EvidenceOfProperty_DeductibleAmount_E":    lambda d: "",
+    "EvidenceOfProperty_CoverageDescription_E": lambda ctx: "Earthquake" if _a27c(ctx, "earthquake") else "",
+    "EvidenceOfProperty_LimitAmount_E":         lambda ctx: _fm(_a27c(ctx, "earthquake")),
+    "EvidenceOfProperty_DeductibleAmount_E":    "",
 
-    # Rows F–J (empty by default)
-    **{f"EvidenceOfProperty_CoverageDescription_{x}": (lambda d: "") for x in "FGHIJ"},
-    **{f"EvidenceOfProperty_LimitAmount_{x}":         (lambda d: "") for x in "FGHIJ"},
-    **{f"EvidenceOfProperty_DeductibleAmount_{x}":    (lambda d: "") for x in "FGHIJ"},
+    # Rows F–J (empty by default — written as constants, no call per fill)
+    **{f"EvidenceOfProperty_CoverageDescription_{x}": "" for x in "FGHIJ"},
+    **{f"EvidenceOfProperty_LimitAmount_{x}":         "" for x in "FGHIJ"},
+    **{f"EvidenceOfProperty_DeductibleAmount_{x}":    "" for x in "FGHIJ"},
 
     # ── Remarks ─────────────────────────────────────────────────────
-    "EvidenceOfProperty_RemarkText_A": lambda d: "",
+    "EvidenceOfProperty_RemarkText_A": "",
 
     # ── Additional Interest / Mortgageholder ────────────────────────
-    "AdditionalInterest_FullName_A":                          lambda d: _a27m(d, "name"),
-    "AdditionalInterest_MailingAddress_LineOne_A":             lambda d: _al1(_a27m(d, "address")),
-    "AdditionalInterest_MailingAddress_LineTwo_A":             lambda d: _al2(_a27m(d, "address")),
-    "AdditionalInterest_MailingAddress_CityName_A":            lambda d: _aci(_a27m(d, "address")),
-    "AdditionalInterest_MailingAddress_StateOrProvinceCode_A": lambda d: _ast(_a27m(d, "address")),
-    "AdditionalInterest_MailingAddress_PostalCode_A":          lambda d: _azp(_a27m(d, "address")),
-    "AdditionalInterest_AccountNumberIdentifier_A":            lambda d: _a27m(d, "loanNumber"),
-    "AdditionalInterest_AccountNumberIdentifier_B":            lambda d: "",
-
-    "AdditionalInterest_Interest_MortgageeIndicator_A":         lambda d: bool(_a27m(d, "name")),
-    "AdditionalInterest_Interest_AdditionalInsuredIndicator_A": lambda d: False,
-    "AdditionalInterest_Interest_LendersLossPayableIndicator_A": lambda d: False,
-    "AdditionalInterest_Interest_LossPayeeIndicator_A":         lambda d: False,
-    "AdditionalInterest_Interest_OtherIndicator_A":             lambda d: False,
-    "AdditionalInterest_Interest_OtherDescription_A":           lambda d: "",
+    "AdditionalInterest_FullName_A":                          lambda ctx: _a27m(ctx, "name"),
+    "AdditionalInterest_MailingAddress_LineOne_A":             lambda ctx: ctx.mortgagee_addr.line1,
+    "AdditionalInterest_MailingAddress_LineTwo_A":             lambda ctx: ctx.mortgagee_addr.line2,
+    "AdditionalInterest_MailingAddress_CityName_A":            lambda ctx: ctx.mortgagee_addr.city,
+    "AdditionalInterest_MailingAddress_StateOrProvinceCode_A": lambda ctx: ctx.mortgagee_addr.state,
+    "AdditionalInterest_MailingAddress_PostalCode_A":          lambda ctx: ctx.mortgagee_addr.zip,
+    "AdditionalInterest_AccountNumberIdentifier_A":            lambda ctx: _a27m(ctx, "loanNumber"),
+    "AdditionalInterest_AccountNumberIdentifier_B":            "",
+
+    "AdditionalInterest_Interest_MortgageeIndicator_A":         attrgetter("a27_has_mortgagee"),
+    "AdditionalInterest_Interest_AdditionalInsuredIndicator_A": False,
+    "AdditionalInterest_Interest_LendersLossPayableIndicator_A": False,
+    "AdditionalInterest_Interest_LossPayeeIndicator_A":         False,
+    "AdditionalInterest_Interest_OtherIndicator_A":             False,
+    "AdditionalInterest_Interest_OtherDescription_A":           "",
 }
 
+_ACORD27_ORDER = tuple(ACORD27_FIELDS.items())
+
 
 # ═════════════════════════════════════════════════════════════════════
 # ACORD 30 — Verified field names from PDF dump (XFA-style F[0].P1[0]. prefix)
@@ -530,221 +752,301 @@ ACORD27_FIELDS = {
 
 # ACORD 30 accessors — reading from acord28 in extracted JSON
 # If your extraction outputs a separate "acord30" key, change these.
-def _a30(d, k): return (d.get("acord30") or d.get("acord28") or {}).get(k, "")
-def _a30_gl(d, k): return (d.get("acord30") or d.get("acord28") or {}).get("garageLiability", {}).get(k)
-def _a30_gk(d, k): return (d.get("acord30") or d.get("acord28") or {}).get("garageKeepers", {}).get(k)
-def _a30_cgl(d, k): return (d.get("acord30") or d.get("acord28") or {}).get("commercialGL", {}).get(k)
-def _a30_umb(d, k):
-    v = (d.get("acord30") or d.get("acord28") or {}).get("umbrella", {}).get(k, "")
-    return _fm(v) if isinstance(v, (int, float)) else v
-def _a30_wc(d, k):
-    v = (d.get("acord30") or d.get("acord28") or {}).get("workersComp", {}).get(k, "")
-    return _fm(v) if isinstance(v, (int, float)) else v
-def _a30e(d, k): return (d.get("acord30") or d.get("acord28") or {}).get("endorsements", {}).get(k, False)
-def _a30_ch(d, k): return (d.get("acord30") or d.get("acord28") or {}).get("certificateHolder", {}).get(k, "")
-
-def _has_a30_garage(d):
-    return bool(_a30(d, "policyNumber") or _a30_gl(d, "autoOnlyEachAccident"))
-
-def _has_a30_cgl(d):
-    return bool(_a30_cgl(d, "included") or _a30_cgl(d, "eachOccurrence") or _a30_cgl(d, "generalAggregate"))
-
-def _has_a30_umbrella(d):
-    return bool(_a30_umb(d, "policyNumber") or _a30_umb(d, "eachOccurrence"))
-
-def _has_a30_wc(d):
-    return bool(_a30_wc(d, "policyNumber") or _a30_wc(d, "eachAccident"))
+def _a30(ctx, k): return ctx.a30.get(k, "")
+def _a30_gl(ctx, k): return ctx.a30_gl.get(k)
+def _a30_gk(ctx, k): return ctx.a30_gk.get(k)
+def _a30_cgl(ctx, k): return ctx.a30_cgl.get(k)
+def _a30_umb(ctx, k): return ctx.a30_umb.get(k, "")
+def _a30_wc(ctx, k): return ctx.a30_wc.get(k, "")
+def _a30e(ctx, k): return ctx.a30_endo.get(k, False)
+def _a30_ch(ctx, k): return ctx.a30_ch.get(k, "")
 
 ACORD30_FIELDS = {
     # ── Header ──────────────────────────────────────────────────────
-    "F[0].P1[0].Form_CompletionDate_A[0]": lambda d: datetime.now().strftime("%m/%d/%Y"),
-    "F[0].P1[0].CertificateOfInsurance_CertificateNumberIdentifier_A[0]": lambda d: "",
-    "F[0].P1[0].CertificateOfInsurance_RevisionNumberIdentifier_A[0]":    lambda d: "",
+    "F[0].P1[0].Form_CompletionDate_A[0]": attrgetter("today"),
+    "F[0].P1[0].CertificateOfInsurance_CertificateNumberIdentifier_A[0]": "",
+    "F[0].P1[0].CertificateOfInsurance_RevisionNumberIdentifier_A[0]":    "",
 
     # ── Producer ────────────────────────────────────────────────────
-    "F[0].P1[0].Producer_FullName_A[0]":                          lambda d: d.get("producer", {}).get("name", ""),
-    "F[0].P1[0].Producer_MailingAddress_LineOne_A[0]":             lambda d: _al1(d.get("producer", {}).get("address", "")),
-    "F[0].P1[0].Producer_MailingAddress_LineTwo_A[0]":             lambda d: _al2(d.get("producer", {}).get("address", "")),
-    "F[0].P1[0].Producer_MailingAddress_CityName_A[0]":            lambda d: _aci(d.get("producer", {}).get("address", "")),
-    "F[0].P1[0].Producer_MailingAddress_StateOrProvinceCode_A[0]": lambda d: _ast(d.get("producer", {}).get("address", "")),
-    "F[0].P1[0].Producer_MailingAddress_PostalCode_A[0]":          lambda d: _azp(d.get("producer", {}).get("address", "")),
-    "F[0].P1[0].Producer_ContactPerson_FullName_A[0]":             lambda d: d.get("producer", {}).get("contactName", ""),
-    "F[0].P1[0].Producer_ContactPerson_PhoneNumber_A[0]":          lambda d: d.get("producer", {}).get("phone", ""),
-    "F[0].P1[0].Producer_FaxNumber_A[0]":                          lambda d: d.get("producer", {}).get("fax", ""),
-    "F[0].P1[0].Producer_ContactPerson_EmailAddress_A[0]":         lambda d: d.get("producer", {}).get("email", ""),
-    "F[0].P1[0].Producer_CustomerIdentifier_A[0]":                 lambda d: "",
-    "F[0].P1[0].Producer_AuthorizedRepresentative_Signature_A[0]": lambda d: "",
+    "F[0].P1[0].Producer_FullName_A[0]":                          lambda ctx: ctx.producer.get("name", ""),
+    "F[0].P1[0].Producer_MailingAddress_LineOne_A[0]":             lambda ctx: ctx.producer_addr.line1,
+    "F[0].P1[0].Producer_MailingAddress_LineTwo_A[0]":             lambda ctx: ctx.producer_addr.line2,
+    "F[0].P1[0].Producer_MailingAddress_CityName_A[0]":            lambda ctx: ctx.producer_addr.city,
+    "F[0].P1[0].Producer_MailingAddress_StateOrProvinceCode_A[0]": lambda ctx: ctx.producer_addr.state,
+    "F[0].P1[0].Producer_MailingAddress_PostalCode_A[0]":          lambda ctx: ctx.producer_addr.zip,
+    "F[0].P1[0].Producer_ContactPerson_FullName_A[0]":             lambda ctx: ctx.producer.get("contactName", ""),
+    "F[0].P1[0].Producer_ContactPerson_PhoneNumber_A[0]":          lambda ctx: ctx.producer.get("phone", ""),
+    "F[0].P1[0].Producer_FaxNumber_A[0]":                          lambda ctx: ctx.producer.get("fax", ""),
+    "F[0].P1[0].Producer_ContactPerson_EmailAddress_A[0]":         lambda ctx: ctx.producer.get("email", ""),
+    "F[0].P1[0].Producer_CustomerIdentifier_A[0]":                 "",
+    "F[0].P1[0].Producer_AuthorizedRepresentative_Signature_A[0]": "",
 
     # ── Insured ─────────────────────────────────────────────────────
-    "F[0].P1[0].NamedInsured_FullName_A[0]":                          lambda d: d.get("insured", {}).get("name", ""),
-    "F[0].P1[0].NamedInsured_MailingAddress_LineOne_A[0]":             lambda d: _al1(d.get("insured", {}).get("address", "")),
-    "F[0].P1[0].NamedInsured_MailingAddress_LineTwo_A[0]":             lambda d: _al2(d.get("insured", {}).get("address", "")),
-    "F[0].P1[0].NamedInsured_MailingAddress_CityName_A[0]":            lambda d: _aci(d.get("insured", {}).get("address", "")),
-    "F[0].P1[0].NamedInsured_MailingAddress_StateOrProvinceCode_A[0]": lambda d: _ast(d.get("insured", {}).get("address", "")),
-    "F[0].P1[0].NamedInsured_MailingAddress_PostalCode_A[0]":          lambda d: _azp(d.get("insured", {}).get("address", "")),
+    "F[0].P1[0].NamedInsured_FullName_A[0]":                          lambda ctx: ctx.insured.get("name", ""),
+    "F[0].P1[0].NamedInsured_MailingAddress_LineOne_A[0]":             lambda ctx: ctx.insured_addr.line1,
+    "F[0].P1[0].NamedInsured_MailingAddress_LineTwo_A[0]":             lambda ctx: ctx.insured_addr.line2,
+    "F[0].P1[0].NamedInsured_MailingAddress_CityName_A[0]":            lambda ctx: ctx.insured_addr.city,
+    "F[0].P1[0].NamedInsured_MailingAddress_StateOrProvinceCode_A[0]": lambda ctx: ctx.insured_addr.state,
+    "F[0].P1[0].NamedInsured_MailingAddress_PostalCode_A[0]":          lambda ctx: ctx.insured_addr.zip,
 
     # ── Carriers A–F ────────────────────────────────────────────────
-    "F[0].P1[0].Insurer_FullName_A[0]": lambda d: _carrier(d, "A"),
-    "F[0].P1[0].Insurer_NAICCode_A[0]": lambda d: _carrier_naic(d, "A"),
-    "F[0].P1[0].Insurer_FullName_B[0]": lambda d: _carrier(d, "B"),
-    "F[0].P1[0].Insurer_NAICCode_B[0]": lambda d: _carrier_naic(d, "B"),
-    "F[0].P1[0].Insurer_FullName_C[0]": lambda d: _carrier(d, "C"),
-    "F[0].P1[0].Insurer_NAICCode_C[0]": lambda d: _carrier_naic(d, "C"),
-    "F[0].P1[0].Insurer_FullName_D[0]": lambda d: _carrier(d, "D"),
-    "F[0].P1[0].Insurer_NAICCode_D[0]": lambda d: _carrier_naic(d, "D"),
-    "F[0].P1[0].Insurer_FullName_E[0]": lambda d: _carrier(d, "E"),
-    "F[0].P1[0].Insurer_NAICCode_E[0]": lambda d: _carrier_naic(d, "E"),
-    "F[0].P1[0].Insurer_FullName_F[0]": lambda d: _carrier(d, "F"),
-    "F[0].P1[0].Insurer_NAICCode_F[0]": lambda d: _carrier_naic(d, "F"),
+    "F[0].P1[0].Insurer_FullName_A[0]": lambda ctx: _carrier(ctx, "A"),
+    "F[0].P1[0].Insurer_NAICCode_A[0]": lambda ctx: _carrier_naic(ctx, "A"),
+    "F[0].P1[0].Insurer_FullName_B[0]": lambda ctx: _carrier(ctx, "B"),
+    "F[0].P1[0].Insurer_NAICCode_B[0]": lambda ctx: _carrier_naic(ctx, "B"),
+    "F[0].P1[0].Insurer_FullName_C[0]": lambda ctx: _carrier(ctx, "C"),
+    "F[0].P1[0].Insurer_NAICCode_C[0]": lambda ctx: _carrier_naic(ctx, "C"),
+    "F[0].P1[0].Insurer_FullName_D[0]": lambda ctx: _carrier(ctx, "D"),
+    "F[0].P1[0].Insurer_NAICCode_D[0]": lambda ctx: _carrier_naic(ctx, "D"),
+    "F[0].P1[0].Insurer_FullName_E[0]": lambda ctx: _carrier(ctx, "E"),
+    "F[0].P1[0].Insurer_NAICCode_E[0]": lambda ctx: _carrier_naic(ctx, "E"),
+    "F[0].P1[0].Insurer_FullName_F[0]": lambda ctx: _carrier(ctx, "F"),
+    "F[0].P1[0].Insurer_NAICCode_F[0]": lambda ctx: _carrier_naic(ctx, "F"),
 
     # ── Garage Liability (Row A) ────────────────────────────────────
-    "F[0].P1[0].GarageLiability_InsurerLetterCode_A[0]":  lambda d: _a30(d, "insurerLetter") or ("A" if _has_a30_garage(d) else ""),
-    "F[0].P1[0].Policy_PolicyNumberIdentifier_A[0]":      lambda d: _a30(d, "policyNumber"),
-    "F[0].P1[0].Policy_EffectiveDate_A[0]":               lambda d: _a30(d, "effectiveDate"),
-    "F[0].P1[0].Policy_ExpirationDate_A[0]":              lambda d: _a30(d, "expirationDate"),
+    "F[0].P1[0].GarageLiability_InsurerLetterCode_A[0]":  lambda ctx: _a30(ctx, "insurerLetter") or ("A" if ctx.has_a30_garage else ""),
+    "F[0].P1[0].Policy_PolicyNumberIdentifier_A[0]":      lambda ctx: _a30(ctx, "policyNumber"),
+    "F[0].P1[0].Policy_EffectiveDate_A[0]":               lambda ctx: _a30(ctx, "effectiveDate"),
+    "F[0].P1[0].Policy_ExpirationDate_A[0]":              lambda ctx: _a30(ctx, "expirationDate"),
 
-    "F[0].P1[0].GarageLiability_AllOwnedAutosIndicator_A[0]":                       lambda d: bool(_a30_gl(d, "allOwnedAutos")),
-    "F[0].P1[0].GarageLiability_HiredAutosIndicator_A[0]":                          lambda d: bool(_a30_gl(d, "hiredAutos")),
-    "F[0].P1[0].GarageLiability_NonOwnedAutosUsedInGarageBusinessIndicator_A[0]":    lambda d: bool(_a30_gl(d, "nonOwnedAutos")),
-    "F[0].P1[0].GarageLiability_OtherIndicator_A[0]":                               lambda d: False,
-    "F[0].P1[0].GarageLiability_OtherDescription_A[0]":                             lambda d: "",
+    "F[0].P1[0].GarageLiability_AllOwnedAutosIndicator_A[0]":                       lambda ctx: bool(_a30_gl(ctx, "allOwnedAutos")),
+    "F[0].P1[0].GarageLiability_HiredAutosIndicator_A[0]":                          lambda ctx: bool(_a30_gl(ctx, "hiredAutos")),
+    "F[0].P1[0].GarageLiability_NonOwnedAutosUsedInGarageBusinessIndicator_A[0]":    lambda ctx: bool(_a30_gl(ctx, "nonOwnedAutos")),
+    "F[0].P1[0].GarageLiability_OtherIndicator_A[0]":                               False,
+    "F[0].P1[0].GarageLiability_OtherDescription_A[0]":                             "",
 
-    "F[0].P1[0].GarageLiability_AutoOnly_EachAccidentLimitAmount_A[0]":             lambda d: _fm(_a30_gl(d, "autoOnlyEachAccident")),
-    "F[0].P1[0].GarageLiability_OtherThanAutoOnly_EachAccidentLimitAmount_A[0]":    lambda d: _fm(_a30_gl(d, "otherThanAutoOnly")),
-    "F[0].P1[0].GarageLiability_OtherThanAutoOnly_AggregateLimitAmount_A[0]":       lambda d: _fm(_a30_gl(d, "autoOnlyAggregate")),
+    "F[0].P1[0].GarageLiability_AutoOnly_EachAccidentLimitAmount_A[0]":             lambda ctx: _fm_fast(_a30_gl(ctx, "autoOnlyEachAccident")),
+    "F[0].P1[0].GarageLiability_OtherThanAutoOnly_EachAccidentLimitAmount_A[0]":    lambda ctx: _fm_fast(_a30_gl(ctx, "otherThanAutoOnly")),
+    "F[0].P1[0].GarageLiability_OtherThanAutoOnly_AggregateLimitAmount_A[0]":       lambda ctx: _fm_fast(_a30_gl(ctx, "autoOnlyAggregate")),
 
     # Endorsements per row — Row A = Garage Liability
-    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_A[0]": lambda d: "Y" if _a30(d, "policyNumber") and _a30e(d, "additionalInsured") else "",
-    "F[0].P1[0].Policy_SubrogationWaivedCode_A[0]":                 lambda d: "Y" if _a30(d, "policyNumber") and _a30e(d, "waiverOfSubrogation") else "",
+    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_A[0]": lambda ctx: "Y" if _a30(ctx, "policyNumber") and _a30e(ctx, "additionalInsured") else "",
+    "F[0].P1[0].Policy_SubrogationWaivedCode_A[0]":                 lambda ctx: "Y" if _a30(ctx, "policyNumber") and _a30e(ctx, "waiverOfSubrogation") else "",
 
     # ── Garage Keepers (Row B) ──────────────────────────────────────
-    "F[0].P1[0].GarageKeepersLiability_InsurerLetterCode_A[0]":    lambda d: _a30(d, "insurerLetter") or ("A" if _has_a30_garage(d) else ""),
-    "F[0].P1[0].Policy_PolicyNumberIdentifier_B[0]":               lambda d: _a30(d, "policyNumber"),
-    "F[0].P1[0].Policy_EffectiveDate_B[0]":                        lambda d: _a30(d, "effectiveDate"),
-    "F[0].P1[0].Policy_ExpirationDate_B[0]":                       lambda d: _a30(d, "expirationDate"),
-
-    "F[0].P1[0].GarageKeepersLiability_LegalLiabilityIndicator_A[0]": lambda d: bool(_a30_gk(d, "legalLiability")),
-    "F[0].P1[0].GarageKeepersLiability_DirectBasisIndicator_A[0]":    lambda d: bool(_a30_gk(d, "directBasis")),
-    "F[0].P1[0].GarageKeepersLiability_PrimaryIndicator_A[0]":        lambda d: bool(_a30_gk(d, "primary")),
-    "F[0].P1[0].GarageKeepersLiability_ExcessIndicator_A[0]":         lambda d: bool(_a30_gk(d, "excess")),
-    "F[0].P1[0].GarageKeepersLiability_ComprehensiveIndicator_A[0]":  lambda d: bool(_a30_gk(d, "comprehensive")),
-    "F[0].P1[0].GarageKeepersLiability_SpecifiedPerilsIndicator_A[0]": lambda d: bool(_a30_gk(d, "specifiedPerils")),
-    "F[0].P1[0].GarageKeepersLiability_CollisionIndicator_A[0]":      lambda d: bool(_a30_gk(d, "collision")),
-
-    "F[0].P1[0].GarageKeepersLiability_ComprehensiveOrSpecifiedPerilsLimitAmount_A[0]": lambda d: _fm(_a30_gk(d, "comprehensive")),
-    "F[0].P1[0].GarageKeepersLiability_ComprehensiveOrSpecifiedPerilsLimitAmount_B[0]": lambda d: "",
-    "F[0].P1[0].GarageKeepersLiability_CollisionLimitAmount_A[0]":                      lambda d: _fm(_a30_gk(d, "collision")),
-    "F[0].P1[0].GarageKeepersLiability_CollisionLimitAmount_B[0]":                      lambda d: "",
-    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_A[0]":                lambda d: "",
-    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_B[0]":                lambda d: "",
-    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_C[0]":                lambda d: "",
-    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_D[0]":                lambda d: "",
-
-    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_B[0]": lambda d: "",
-    "F[0].P1[0].Policy_SubrogationWaivedCode_B[0]":                 lambda d: "",
+    "F[0].P1[0].GarageKeepersLiability_InsurerLetterCode_A[0]":    lambda ctx: _a30(ctx, "insurerLetter") or ("A" if ctx.has_a30_garage else ""),
+    "F[0].P1[0].Policy_PolicyNumberIdentifier_B[0]":               lambda ctx: _a30(ctx, "policyNumber"),
+    "F[0].P1[0].Policy_EffectiveDate_B[0]":                        lambda ctx: _a30(ctx, "effectiveDate"),
+    "F[0].P1[0].Policy_ExpirationDate_B[0]":                       lambda ctx: _a30(ctx, "expirationDate"),
+
+    "F[0].P1[0].GarageKeepersLiability_LegalLiabilityIndicator_A[0]": lambda ctx: bool(_a30_gk(ctx, "legalLiability")),
+    "F[0].P1[0].GarageKeepersLiability_DirectBasisIndicator_A[0]":    lambda ctx: bool(_a30_gk(ctx, "directBasis")),
+    "F[0].P1[0].GarageKeepersLiability_PrimaryIndicator_A[0]":        lambda ctx: bool(_a30_gk(ctx, "primary")),
+    "F[0].P1[0].GarageKeepersLiability_ExcessIndicator_A[0]":         lambda ctx: bool(_a30_gk(ctx, "excess")),
+    "F[0].P1[0].GarageKeepersLiability_ComprehensiveIndicator_A[0]":  lambda ctx: bool(_a30_gk(ctx, "comprehensive")),
+    "F[0].P1[0].GarageKeepersLiability_SpecifiedPerilsIndicator_A[0]": lambda ctx: bool(_a30_gk(ctx, "specifiedPerils")),
+    "F[0].P1[0].GarageKeepersLiability_CollisionIndicator_A[0]":      lambda ctx: bool(_a30_gk(ctx, "collision")),
+
+    "F[0].P1[0].GarageKeepersLiability_ComprehensiveOrSpecifiedPerilsLimitAmount_A[0]": lambda ctx: _fm_fast(_a30_gk(ctx, "comprehensive")),
+    "F[0].P1[0].GarageKeepersLiability_ComprehensiveOrSpecifiedPerilsLimitAmount_B[0]": "",
+    "F[0].P1[0].GarageKeepersLiability_CollisionLimitAmount_A[0]":                      lambda ctx: _fm_fast(_a30_gk(ctx, "collision")),
+    "F[0].P1[0].GarageKeepersLiability_CollisionLimitAmount_B[0]":                      "",
+    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_A[0]":                "",
+    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_B[0]":                "",
+    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_C[0]":                "",
+    "F[0].P1[0].GarageKeepersLiability_LocationProducerIdentifier_D[0]":                "",
+
+    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_B[0]": "",
+    "F[0].P1[0].Policy_SubrogationWaivedCode_B[0]":                 "",
 
     # ── General Liability (Row C) ───────────────────────────────────
-    "F[0].P1[0].GeneralLiability_InsurerLetterCode_A[0]":          lambda d: (_a30(d, "insurerLetter") or ("A" if _has_a30_cgl(d) else "")) if _has_a30_cgl(d) else "",
-    "F[0].P1[0].Policy_PolicyNumberIdentifier_C[0]":               lambda d: _a30(d, "policyNumber") if _a30_cgl(d, "included") else "",
-    "F[0].P1[0].Policy_EffectiveDate_C[0]":                        lambda d: _a30(d, "effectiveDate") if _a30_cgl(d, "included") else "",
-    "F[0].P1[0].Policy_ExpirationDate_C[0]":                       lambda d: _a30(d, "expirationDate") if _a30_cgl(d, "included") else "",
-
-    "F[0].P1[0].GeneralLiability_CoverageIndicator_A[0]":         lambda d: _has_a30_cgl(d),
-    "F[0].P1[0].GeneralLiability_ClaimsMadeIndicator_A[0]":       lambda d: False,
-    "F[0].P1[0].GeneralLiability_OccurrenceIndicator_A[0]":       lambda d: bool(_a30_cgl(d, "included")),
-
-    "F[0].P1[0].GeneralLiability_EachOccurrence_LimitAmount_A[0]":                        lambda d: _fm(_a30_cgl(d, "eachOccurrence")),
-    "F[0].P1[0].GeneralLiability_FireDamageRentedPremises_EachOccurrenceLimitAmount_A[0]": lambda d: _fm(_a30_cgl(d, "damageToRentedPremises")),
-    "F[0].P1[0].GeneralLiability_MedicalExpense_EachPersonLimitAmount_A[0]":               lambda d: _fm(_a30_cgl(d, "medicalExpense")),
-    "F[0].P1[0].GeneralLiability_PersonalAndAdvertisingInjury_LimitAmount_A[0]":           lambda d: _fm(_a30_cgl(d, "personalAdvInjury")),
-    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAmount_A[0]":                       lambda d: _fm(_a30_cgl(d, "generalAggregate")),
-    "F[0].P1[0].GeneralLiability_ProductsAndCompletedOperations_AggregateLimitAmount_A[0]": lambda d: _fm(_a30_cgl(d, "productsCompOp")),
-
-    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAppliesPerPolicyIndicator_A[0]":   lambda d: _has_a30_cgl(d),
-    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAppliesPerProjectIndicator_A[0]":  lambda d: False,
-    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAppliesPerLocationIndicator_A[0]": lambda d: False,
-
-    "F[0].P1[0].GeneralLiability_OtherCoverageIndicator_A[0]":    lambda d: False,
-    "F[0].P1[0].GeneralLiability_OtherCoverageIndicator_B[0]":    lambda d: False,
-    "F[0].P1[0].GeneralLiability_OtherCoverageDescription_A[0]":  lambda d: "",
-    "F[0].P1[0].GeneralLiability_OtherCoverageDescription_B[0]":  lambda d: "",
-    "F[0].P1[0].GeneralLiability_OtherCoverageLimitAmount_A[0]":  lambda d: "",
-    "F[0].P1[0].GeneralLiability_OtherCoverageLimitDescription_A[0]": lambda d: "",
-
-    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_C[0]": lambda d: "Y" if _a30_cgl(d, "included") and _a30e(d, "additionalInsured") else "",
-    "F[0].P1[0].Policy_SubrogationWaivedCode_C[0]":                 lambda d: "Y" if _a30_cgl(d, "included") and _a30e(d, "waiverOfSubrogation") else "",
+    "F[0].P1[0].GeneralLiability_InsurerLetterCode_A[0]":          lambda ctx: (_a30(ctx, "insurerLetter") or ("A" if ctx.has_a30_cgl else "")) if ctx.has_a30_cgl else "",
+    "F[0].P1[0].Policy_PolicyNumberIdentifier_C[0]":               lambda ctx: _a30(ctx, "policyNumber") if _a30_cgl(ctx, "included") else "",
+    "F[0].P1[0].Policy_EffectiveDate_C[0]":                        lambda ctx: _a30(ctx, "effectiveDate") if _a30_cgl(ctx, "included") else "",
+    "F[0].P1[0].Policy_ExpirationDate_C[0]":                       lambda ctx: _a30(ctx, "expirationDate") if _a30_cgl(ctx, "included") else "",
+
+    "F[0].P1[0].GeneralLiability_CoverageIndicator_A[0]":         lambda ctx: ctx.has_a30_cgl,
+    "F[0].P1[0].GeneralLiability_ClaimsMadeIndicator_A[0]":       False,
+    "F[0].P1[0].GeneralLiability_OccurrenceIndicator_A[0]":       lambda ctx: bool(_a30_cgl(ctx, "included")),
+
+    "F[0].P1[0].GeneralLiability_EachOccurrence_LimitAmount_A[0]":                        lambda ctx: _fm_fast(_a30_cgl(ctx, "eachOccurrence")),
+    "F[0].P1[0].GeneralLiability_FireDamageRentedPremises_EachOccurrenceLimitAmount_A[0]": lambda ctx: _fm_fast(_a30_cgl(ctx, "damageToRentedPremises")),
+    "F[0].P1[0].GeneralLiability_MedicalExpense_EachPersonLimitAmount_A[0]":               lambda ctx: _fm_fast(_a30_cgl(ctx, "medicalExpense")),
+    "F[0].P1[0].GeneralLiability_PersonalAndAdvertisingInjury_LimitAmount_A[0]":           lambda ctx: _fm_fast(_a30_cgl(ctx, "personalAdvInjury")),
+    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAmount_A[0]":                       lambda ctx: _fm_fast(_a30_cgl(ctx, "generalAggregate")),
+    "F[0].P1[0].GeneralLiability_ProductsAndCompletedOperations_AggregateLimitAmount_A[0]": lambda ctx: _fm_fast(_a30_cgl(ctx, "productsCompOp")),
+
+    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAppliesPerPolicyIndicator_A[0]":   lambda ctx: ctx.has_a30_cgl,
+    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAppliesPerProjectIndicator_A[0]":  False,
+    "F[0].P1[0].GeneralLiability_GeneralAggregate_LimitAppliesPerLocationIndicator_A[0]": False,
+
+    "F[0].P1[0].GeneralLiability_OtherCoverageIndicator_A[0]":    False,
+    "F[0].P1[0].GeneralLiability_OtherCoverageIndicator_B[0]":    False,
+    "F[0].P1[0].GeneralLiability_OtherCoverageDescription_A[0]":  "",
+    "F[0].P1[0].GeneralLiability_OtherCoverageDescription_B[0]":  "",
+    "F[0].P1[0].GeneralLiability_OtherCoverageLimitAmount_A[0]":  "",
+    "F[0].P1[0].GeneralLiability_OtherCoverageLimitDescription_A[0]": "",
+
+    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_C[0]": lambda ctx: "Y" if _a30_cgl(ctx, "included") and _a30e(ctx, "additionalInsured") else "",
+    "F[0].P1[0].Policy_SubrogationWaivedCode_C[0]":                 lambda ctx: "Y" if _a30_cgl(ctx, "included") and _a30e(ctx, "waiverOfSubrogation") else "",
 
     # ── Other Policy (Row D — blank) ────────────────────────────────
-    "F[0].P1[0].OtherPolicy_InsurerLetterCode_A[0]":    lambda d: "",
-    "F[0].P1[0].OtherPolicy_OtherPolicyDescription_A[0]": lambda d: "",
-    "F[0].P1[0].Policy_PolicyNumberIdentifier_D[0]":    lambda d: "",
-    "F[0].P1[0].Policy_EffectiveDate_D[0]":             lambda d: "",
-    "F[0].P1[0].Policy_ExpirationDate_D[0]":            lambda d: "",
-    "F[0].P1[0].OtherPolicy_CoverageLimitAmount_A[0]":  lambda d: "",
-    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_D[0]": lambda d: "",
-    "F[0].P1[0].Policy_SubrogationWaivedCode_D[0]":     lambda d: "",
+    "F[0].P1[0].OtherPolicy_InsurerLetterCode_A[0]":    "",
+    "F[0].P1[0].OtherPolicy_OtherPolicyDescription_A[0]": "",
+    "F[0].P1[0].Policy_PolicyNumberIdentifier_D[0]":    "",
+    "F[0].P1[0].Policy_EffectiveDate_D[0]":             "",
+    "F[0].P1[0].Policy_ExpirationDate_D[0]":            "",
+    "F[0].P1[0].OtherPolicy_CoverageLimitAmount_A[0]":  "",
+    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_D[0]": "",
+    "F[0].P1[0].Policy_SubrogationWaivedCode_D[0]":     "",
 
     # ── Umbrella / Excess (Row E) ───────────────────────────────────
-    "F[0].P1[0].ExcessUmbrella_InsurerLetterCode_A[0]":           lambda d: _a30_umb(d, "insurerLetter") or ("A" if _has_a30_umbrella(d) else ""),
-    "F[0].P1[0].Policy_PolicyNumberIdentifier_E[0]":              lambda d: _a30_umb(d, "policyNumber"),
-    "F[0].P1[0].Policy_EffectiveDate_E[0]":                       lambda d: _a30_umb(d, "effectiveDate"),
-    "F[0].P1[0].Policy_ExpirationDate_E[0]":                      lambda d: _a30_umb(d, "expirationDate"),
-
-    "F[0].P1[0].Policy_PolicyType_UmbrellaIndicator_A[0]": lambda d: bool(_a30_umb(d, "eachOccurrence")),
-    "F[0].P1[0].Policy_PolicyType_ExcessIndicator_A[0]":   lambda d: False,
-    "F[0].P1[0].ExcessUmbrella_OccurrenceIndicator_A[0]":  lambda d: bool(_a30_umb(d, "eachOccurrence")),
-    "F[0].P1[0].ExcessUmbrella_ClaimsMadeIndicator_A[0]":  lambda d: False,
-    "F[0].P1[0].ExcessUmbrella_DeductibleIndicator_A[0]":  lambda d: False,
-    "F[0].P1[0].ExcessUmbrella_RetentionIndicator_A[0]":   lambda d: bool(_a30_umb(d, "retention")),
-
-    "F[0].P1[0].ExcessUmbrella_Umbrella_EachOccurrenceAmount_A[0]":        lambda d: _fm(_a30_umb(d, "eachOccurrence")),
-    "F[0].P1[0].ExcessUmbrella_Umbrella_AggregateAmount_A[0]":             lambda d: _fm(_a30_umb(d, "aggregate")),
-    "F[0].P1[0].ExcessUmbrella_Umbrella_DeductibleOrRetentionAmount_A[0]": lambda d: _fm(_a30_umb(d, "retention")),
-    "F[0].P1[0].ExcessUmbrella_OtherCoverageDescription_A[0]":             lambda d: "",
-    "F[0].P1[0].ExcessUmbrella_OtherCoverageLimitAmount_A[0]":             lambda d: "",
-
-    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_F[0]": lambda d: "",
-    "F[0].P1[0].Policy_SubrogationWaivedCode_E[0]":                 lambda d: "",
+    "F[0].P1[0].ExcessUmbrella_InsurerLetterCode_A[0]":           lambda ctx: _a30_umb(ctx, "insurerLetter") or ("A" if ctx.has_a30_umbrella else ""),
+    "F[0].P1[0].Policy_PolicyNumberIdentifier_E[0]":              lambda ctx: _a30_umb(ctx, "policyNumber"),
+    "F[0].P1[0].Policy_EffectiveDate_E[0]":                       lambda ctx: _a30_umb(ctx, "effectiveDate"),
+    "F[0].P1[0].Policy_ExpirationDate_E[0]":                      lambda ctx: _a30_umb(ctx, "expirationDate"),
+
+    "F[0].P1[0].Policy_PolicyType_UmbrellaIndicator_A[0]": lambda ctx: bool(_a30_umb(ctx, "eachOccurrence")),
+    "F[0].P1[0].Policy_PolicyType_ExcessIndicator_A[0]":   False,
+    "F[0].P1[0].ExcessUmbrella_OccurrenceIndicator_A[0]":  lambda ctx: bool(_a30_umb(ctx, "eachOccurrence")),
+    "F[0].P1[0].ExcessUmbrella_ClaimsMadeIndicator_A[0]":  False,
+    "F[0].P1[0].ExcessUmbrella_DeductibleIndicator_A[0]":  False,
+    "F[0].P1[0].ExcessUmbrella_RetentionIndicator_A[0]":   lambda ctx: bool(_a30_umb(ctx, "retention")),
+
+    "F[0].P1[0].ExcessUmbrella_Umbrella_EachOccurrenceAmount_A[0]":        lambda ctx: _fm_fast(_a30_umb(ctx, "eachOccurrence")),
+    "F[0].P1[0].ExcessUmbrella_Umbrella_AggregateAmount_A[0]":             lambda ctx: _fm_fast(_a30_umb(ctx, "aggregate")),
+    "F[0].P1[0].ExcessUmbrella_Umbrella_DeductibleOrRetentionAmount_A[0]": lambda ctx: _fm_fast(_a30_umb(ctx, "retention")),
+    "F[0].P1[0].ExcessUmbrella_OtherCoverageDescription_A[0]":             "",
+    "F[0].P1[0].ExcessUmbrella_OtherCoverageLimitAmount_A[0]":             "",
+
+    "F[0].P1[0].CertificateOfInsurance_AdditionalInsuredCode_F[0]": "",
+    "F[0].P1[0].Policy_SubrogationWaivedCode_E[0]":                 "",
 
     # ── Workers Comp (Row F) ────────────────────────────────────────
-    "F[0].P1[0].WorkersCompensationEmployersLiability_InsurerLetterCode_A[0]":    lambda d: _a30_wc(d, "insurerLetter") or ("A" if _has_a30_wc(d) else ""),
-    "F[0].P1[0].Policy_PolicyNumberIdentifier_F[0]":                              lambda d: _a30_wc(d, "policyNumber"),
-    "F[0].P1[0].Policy_EffectiveDate_F[0]":                                       lambda d: _a30_wc(d, "effectiveDate"),
-    "F[0].P1[0].Policy_ExpirationDate_F[0]":                                      lambda d: _a30_wc(d, "expirationDate"),
+    "F[0].P1[0].WorkersCompensationEmployersLiability_InsurerLetterCode_A[0]":    lambda ctx: _a30_wc(ctx, "insurerLetter") or ("A" if ctx.has_a30_wc else ""),
+    "F[0].P1[0].Policy_PolicyNumberIdentifier_F[0]":                              lambda ctx: _a30_wc(ctx, "policyNumber"),
+    "F[0].P1[0].Policy_EffectiveDate_F[0]":                                       lambda ctx: _a30_wc(ctx, "effectiveDate"),
+    "F[0].P1[0].Policy_ExpirationDate_F[0]":                                      lambda ctx: _a30_wc(ctx, "expirationDate"),
 
-    "F[0].P1[0].WorkersCompensationEmployersLiability_WorkersCompensationStatutoryLimitIndicator_A[0]": lambda d: bool(_a30_wc(d, "eachAccident")),
-    "F[0].P1[0].WorkersCompensationEmployersLiability_OtherCoverageIndicator_A[0]":    lambda d: False,
-    "F[0].P1[0].WorkersCompensationEmployersLiability_OtherCoverageDescription_A[0]":  lambda d: "",
-    "F[0].P1[0].WorkersCompensationEmployersLiability_AnyPersonsExcludedIndicator_A[0]": lambda d: "",
+    "F[0].P1[0].WorkersCompensationEmployersLiability_WorkersCompensationStatutoryLimitIndicator_A[0]": lambda ctx: bool(_a30_wc(ctx, "eachAccident")),
+    "F[0].P1[0].WorkersCompensationEmployersLiability_OtherCoverageIndicator_A[0]":    False,
+    "F[0].P1[0].WorkersCompensationEmployersLiability_OtherCoverageDescription_A[0]":  "",
+    "F[0].P1[0].WorkersCompensationEmployersLiability_AnyPersonsExcludedIndicator_A[0]": "",
 
-    "F[0].P1[0].WorkersCompensationEmployersLiability_EmployersLiability_EachAccidentLimitAmount_A[0]":       lambda d: _fm(_a30_wc(d, "eachAccident")),
-    "F[0].P1[0].WorkersCompensationEmployersLiability_EmployersLiability_DiseaseEachEmployeeLimitAmount_A[0]": lambda d: _fm(_a30_wc(d, "diseaseEachEmployee")),
-    "F[0].P1[0].WorkersCompensationEmployersLiability_EmployersLiability_DiseasePolicyLimitAmount_A[0]":      lambda d: _fm(_a30_wc(d, "diseasePolicyLimit")),
+    "F[0].P1[0].WorkersCompensationEmployersLiability_EmployersLiability_EachAccidentLimitAmount_A[0]":       lambda ctx: _fm_fast(_a30_wc(ctx, "eachAccident")),
+    "F[0].P1[0].WorkersCompensationEmployersLiability_EmployersLiability_DiseaseEachEmployeeLimitAmount_A[0]": lambda ctx: _fm_fast(_a30_wc(ctx, "diseaseEachEmployee")),
+    "F[0].P1[0].WorkersCompensationEmployersLiability_EmployersLiability_DiseasePolicyLimitAmount_A[0]":      lambda ctx: _fm_fast(_a30_wc(ctx, "diseasePolicyLimit")),
 
-    "F[0].P1[0].Policy_SubrogationWaivedCode_F[0]": lambda d: "Y" if _a30_wc(d, "policyNumber") and _a30e(d, "waiverOfSubrogation") else "",
+    "F[0].P1[0].Policy_SubrogationWaivedCode_F[0]": lambda ctx: "Y" if _a30_wc(ctx, "policyNumber") and _a30e(ctx, "waiverOfSubrogation") else "",
 
     # ── Remarks ─────────────────────────────────────────────────────
-    "F[0].P1[0].CertificateOfLiabilityInsurance_ACORDForm_RemarkText_A[0]": lambda d: _a30(d, "remarks"),
+    "F[0].P1[0].CertificateOfLiabilityInsurance_ACORDForm_RemarkText_A[0]": lambda ctx: _a30(ctx, "remarks"),
 
     # ── Certificate Holder ──────────────────────────────────────────
-    "F[0].P1[0].CertificateHolder_FullName_A[0]":                          lambda d: _a30_ch(d, "name"),
-    "F[0].P1[0].CertificateHolder_MailingAddress_LineOne_A[0]":             lambda d: _al1(_a30_ch(d, "address")),
-    "F[0].P1[0].CertificateHolder_MailingAddress_LineTwo_A[0]":             lambda d: _al2(_a30_ch(d, "address")),
-    "F[0].P1[0].CertificateHolder_MailingAddress_CityName_A[0]":            lambda d: _aci(_a30_ch(d, "address")),
-    "F[0].P1[0].CertificateHolder_MailingAddress_StateOrProvinceCode_A[0]": lambda d: _ast(_a30_ch(d, "address")),
-    "F[0].P1[0].CertificateHolder_MailingAddress_PostalCode_A[0]":          lambda d: _azp(_a30_ch(d, "address")),
+    "F[0].P1[0].CertificateHolder_FullName_A[0]":                          lambda ctx: _a30_ch(ctx, "name"),
+    "F[0].P1[0].CertificateHolder_MailingAddress_LineOne_A[0]":             lambda ctx: ctx.a30_ch_addr.line1,
+    "F[0].P1[0].CertificateHolder_MailingAddress_LineTwo_A[0]":             lambda ctx: ctx.a30_ch_addr.line2,
+    "F[0].P1[0].CertificateHolder_MailingAddress_CityName_A[0]":            lambda ctx: ctx.a30_ch_addr.city,
+    "F[0].P1[0].CertificateHolder_MailingAddress_StateOrProvinceCode_A[0]": lambda ctx: ctx.a30_ch_addr.state,
+    "F[0].P1[0].CertificateHolder_MailingAddress_PostalCode_A[0]":          lambda ctx: ctx.a30_ch_addr.zip,
 }
 
+_ACORD30_ORDER = tuple(ACORD30_FIELDS.items())
+
 # ═════════════════════════════════════════════════════════════════════
 # ACORD 28 — TODO: run dump_pdf_fields.py on acord28.pdf and populate
 # ═════════════════════════════════════════════════════════════════════
 ACORD28_FIELDS = {}  # Placeholder — populate after field dump
+_ACORD28_ORDER = tuple(ACORD28_FIELDS.items())
 
 
 # ═════════════════════════════════════════════════════════════════════
 # PDF Filling Engine
 # ═════════════════════════════════════════════════════════════════════
 
+# Output directories already created this process — avoids a stat+mkdir
+# per fill when writing batches into the same directory.
+_MADE_DIRS: set = set()
+
+# Template PDFs rarely change; cache the parsed reader keyed by mtime
+# so repeated fills skip both the disk read and the xref/page parse,
+# while a swapped-out template is still picked up. Cloning never
+# mutates the reader, but pypdf resolves objects lazily and that
+# resolution is not thread-safe — concurrent fills of the SAME template
+# (e.g. two sessions clicking Generate) must serialize on the
+# per-template lock below. Different templates still fill in parallel.
+_TEMPLATE_READER_CACHE: dict[str, tuple[float, PdfReader]] = {}
+_TEMPLATE_LOCKS: dict[str, threading.Lock] = {}
+_TEMPLATE_LOCKS_GUARD = threading.Lock()
+
+
+def _template_lock(template_path: str) -> threading.Lock:
+    with _TEMPLATE_LOCKS_GUARD:
+        lock = _TEMPLATE_LOCKS.get(template_path)
+        if lock is None:
+            lock = _TEMPLATE_LOCKS[template_path] = threading.Lock()
+        return lock
+
+
+# A field table compiled into parallel tuples (struct-of-arrays):
+# constants are written as-is, callables are invoked with the FillCtx.
+# Empty/false constants are dropped at compile time, so every fill
+# starts from a ready-made dict instead of re-filtering static entries.
+FieldPlan = namedtuple("FieldPlan", "const_names const_vals func_names funcs")
+
+
+_MISS = object()  # sentinel: distinguishes "no mapping" from falsy values
+
+# Immutable pypdf wrappers reused across every field write
+_N_V = NameObject("/V")
+_N_AS = NameObject("/AS")
+_N_NEED = NameObject("/NeedAppearances")
+_B_TRUE = BooleanObject(True)
+
+
+def _compile_plan(field_map) -> FieldPlan:
+    items = field_map.items() if hasattr(field_map, "items") else field_map
+    const_names, const_vals, func_names, funcs = [], [], [], []
+    for name, resolver in items:
+        if callable(resolver):
+            func_names.append(name)
+            funcs.append(resolver)
+        elif not (resolver is None or resolver == "" or resolver is False):
+            const_names.append(name)
+            const_vals.append(resolver)
+    return FieldPlan(tuple(const_names), tuple(const_vals), tuple(func_names), tuple(funcs))
+
+
+# Plans for the module's own tables, compiled once at import; plans for
+# maps passed in by callers are cached by identity (the stored reference
+# keeps the map alive, so ids cannot be recycled).
+_PLAN_CACHE: dict[int, tuple] = {}
+
+
+def _plan_for(field_map) -> FieldPlan:
+    if isinstance(field_map, FieldPlan):
+        return field_map
+    cached = _PLAN_CACHE.get(id(field_map))
+    if cached is not None:
+        return cached[1]
+    plan = _compile_plan(field_map)
+    _PLAN_CACHE[id(field_map)] = (field_map, plan)
+    return plan
+
+
+_ACORD25_PLAN = _compile_plan(_ACORD25_ORDER)
+_ACORD27_PLAN = _compile_plan(_ACORD27_ORDER)
+_ACORD28_PLAN = _compile_plan(_ACORD28_ORDER)
+_ACORD30_PLAN = _compile_plan(_ACORD30_ORDER)
+
+
+# Field name -> /FT per template, learned on the first fill. The type
+# is a property of the template, not the data, so later fills skip the
+# /FT probe and parent-chain walk entirely.
+_FIELD_TYPE_CACHE: dict[str, dict[str, str]] = {}
+
+
+def _template_reader(template_path: str) -> PdfReader:
+    mtime = os.path.getmtime(template_path)
+    cached = _TEMPLATE_READER_CACHE.get(template_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    reader = PdfReader(BytesIO(Path(template_path).read_bytes()))
+    _TEMPLATE_READER_CACHE[template_path] = (mtime, reader)
+    _FIELD_TYPE_CACHE.pop(template_path, None)
+    return reader
+
+
 def _discover_checkbox_on_state(annot) -> str:
     """Find the 'on' state name from a checkbox's appearance dict."""
     ap = annot.get("/AP")
@@ -763,135 +1065,210 @@ def _discover_checkbox_on_state(annot) -> str:
     return "/Yes"
 
 
-def _get_field_type(annot) -> str:
-    """Get field type, walking up parent chain if needed."""
-    ft = annot.get("/FT", "")
-    if ft:
-        return str(ft)
+def _walk_field_type(annot) -> str:
+    """Slow path: find /FT on the parent chain for annots without one."""
     parent = annot.get("/Parent")
     while parent:
         po = parent.get_object() if hasattr(parent, "get_object") else parent
         ft = po.get("/FT", "")
         if ft:
-            return str(ft)
+            # NameObject is a str subclass — compares fine against "/Btn"
+            return ft
         parent = po.get("/Parent")
     return ""
 
 
+def _iter_annots(writer):
+    """Yield dereferenced annotation objects across all pages."""
+    for page in writer.pages:
+        annots = page.get("/Annots")
+        if not annots:
+            continue
+        for annot_ref in annots:
+            yield annot_ref.get_object()
+
+
 def _get_qualified_name(annot) -> str:
     """Build fully qualified field name by walking parent chain."""
+    # /T values are pypdf string subclasses; join handles them directly
     t = annot.get("/T", "")
-    parts = [str(t)] if t else []
+    parts = [t] if t else []
     parent = annot.get("/Parent")
     while parent:
         po = parent.get_object() if hasattr(parent, "get_object") else parent
         pt = po.get("/T", "")
         if pt:
-            parts.insert(0, str(pt))
+            parts.insert(0, pt)
         parent = po.get("/Parent")
     return ".".join(parts) if parts else ""
 
 
-def fill_pdf(template_path: str, output_path: str, field_map: dict, data: dict):
-    """Fill a PDF form. field_map: { "PDF Field Name": lambda data -> value }"""
-    reader = PdfReader(template_path)
-    writer = PdfWriter()
-    writer.clone_document_from_reader(reader)
-
-    # Resolve all values
-    fill_values = {}
-    for field_name, resolver in field_map.items():
+def _fill_to_buffer(template_path: str, field_map: dict, data: dict,
+                    regenerate_appearances: bool):
+    """Shared fill core: returns (BytesIO or None, filled count,
+    unmatched field names). The buffer is None when the plan resolved
+    no values at all."""
+    with _template_lock(template_path):
+        reader = _template_reader(template_path)
+        writer = PdfWriter()
+        writer.clone_document_from_reader(reader)
+
+    # Resolve all values against a context built once per document
+    ctx = build_ctx(data)
+    plan = _plan_for(field_map)
+    fill_values = dict(zip(plan.const_names, plan.const_vals))
+    # The accessors are written to be total over ctx, but extraction
+    # output drifts in ways no grid of guards fully anticipates — keep
+    # the catch per field so one bad value skips that field alone
+    # instead of everything after it in plan order.
+    for field_name, resolver in zip(plan.func_names, plan.funcs):
         try:
-            val = resolver(data) if callable(resolver) else resolver
+            val = resolver(ctx)
         except Exception as e:
-            print(f"  ⚠ Error resolving {field_name}: {e}")
+            logger.warning("Error resolving %s: %s — field skipped", field_name, e)
             continue
-        # Skip empty/false/None — they don't need to be written
         if val is None or val == "" or val is False:
             continue
         fill_values[field_name] = val
 
     if not fill_values:
         print(f"  ⚠ No values to fill")
-        return output_path
+        return None, 0, set()
 
     # Fill by walking annotations on each page
     filled = 0
     matched_fields = set()
 
-    for page in writer.pages:
-        if "/Annots" not in page:
-            continue
-        for annot_ref in page["/Annots"]:
-            annot = annot_ref.get_object()
-            short_name = str(annot.get("/T", ""))
+    fv_get = fill_values.get
+    ftype_map = _FIELD_TYPE_CACHE.setdefault(template_path, {})
+    ftype_get = ftype_map.get
+    # On-state discovery chases indirect refs; identical checkboxes share
+    # their /AP object, so memoize per appearance identity for this PDF.
+    on_state_cache = {}
+    for annot in _iter_annots(writer):
+        # /T is already a str subclass; no str() copy needed to probe
+        short_name = annot.get("/T", "")
+
+        # Match: try the short name; walk the parent chain for the
+        # qualified name only when the short name missed.
+        val = fv_get(short_name, _MISS)
+        if val is _MISS:
             qualified = _get_qualified_name(annot)
-
-            # Match: try short name first, then qualified
-            val = fill_values.get(short_name) or fill_values.get(qualified)
-            if val is None:
+            val = fv_get(qualified, _MISS)
+            if val is _MISS:
                 continue
-
-            ft = _get_field_type(annot)
-
-            if ft == "/Btn":
-                # Checkbox or radio button
-                if val is True or (isinstance(val, str) and val.upper() in ("Y", "YES")):
-                    on_state = _discover_checkbox_on_state(annot)
-                    annot.update({
-                        NameObject("/V"): NameObject(on_state),
-                        NameObject("/AS"): NameObject(on_state),
-                    })
-                    filled += 1
-                    matched_fields.add(short_name or qualified)
-            else:
-                # Text field
-                annot.update({
-                    NameObject("/V"): TextStringObject(str(val)),
-                })
-                if "/AP" in annot:
-                    del annot["/AP"]
+            matched_name = qualified
+        else:
+            matched_name = short_name
+
+        # ACORD templates put /FT on the leaf; probe it (and walk
+        # parents if genuinely missing) only the first time this
+        # template sees the field.
+        ft = ftype_get(matched_name)
+        if ft is None:
+            ft = annot.get("/FT") or _walk_field_type(annot)
+            ftype_map[matched_name] = ft
+
+        if ft == "/Btn":
+            # Checkbox or radio button
+            if val is True or (isinstance(val, str) and val.upper() in ("Y", "YES")):
+                ap_key = id(annot.raw_get("/AP")) if "/AP" in annot else 0
+                on_name = on_state_cache.get(ap_key)
+                if on_name is None:
+                    on_name = NameObject(_discover_checkbox_on_state(annot))
+                    on_state_cache[ap_key] = on_name
+                annot.update({_N_V: on_name, _N_AS: on_name})
                 filled += 1
-                matched_fields.add(short_name or qualified)
+                matched_fields.add(matched_name)
+        else:
+            # Text field
+            annot.update({_N_V: TextStringObject(str(val))})
+            if regenerate_appearances and "/AP" in annot:
+                del annot["/AP"]
+            filled += 1
+            matched_fields.add(matched_name)
 
     # Force PDF viewers to re-render field appearances
     if "/AcroForm" in writer._root_object:
-        writer._root_object["/AcroForm"].update({
-            NameObject("/NeedAppearances"): BooleanObject(True)
-        })
+        writer._root_object["/AcroForm"].update({_N_NEED: _B_TRUE})
 
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    # Serialize to memory so callers can write one large syscall (or
+    # skip the filesystem entirely) instead of pypdf's many small writes.
+    buf = BytesIO()
+    writer.write(buf)
+    return buf, filled, set(fill_values.keys()) - matched_fields
 
-    # Report unmatched
-    unmatched = set(fill_values.keys()) - matched_fields
-    print(f"  ✓ Filled {filled} fields → {output_path}")
+
+def _report_unmatched(unmatched):
     if unmatched:
-        print(f"  ⚠ {len(unmatched)} mapped fields not found in PDF:")
-        for s in sorted(unmatched)[:10]:
-            print(f"      - {s}")
+        # One log record, built in memory; nsmallest avoids sorting the
+        # whole set just to preview the first ten names.
+        preview = "\n".join(f"      - {s}" for s in heapq.nsmallest(10, unmatched))
         if len(unmatched) > 10:
-            print(f"      ... and {len(unmatched) - 10} more")
+            preview += f"\n      ... and {len(unmatched) - 10} more"
+        logger.warning("%d mapped fields not found in PDF:\n%s", len(unmatched), preview)
+
+
+def fill_pdf(template_path: str, output_path: str, field_map: dict, data: dict,
+             regenerate_appearances: bool = False):
+    """Fill a PDF form. field_map: { "PDF Field Name": lambda ctx -> value }
+
+    regenerate_appearances: also strip each text field's /AP stream.
+    /NeedAppearances alone makes conforming viewers re-render, so this
+    is off by default; enable it for viewers that honor stale streams.
+    """
+    buf, filled, unmatched = _fill_to_buffer(template_path, field_map, data,
+                                             regenerate_appearances)
+    if buf is None:
+        return output_path
+
+    out = Path(output_path)
+    parent = str(out.parent)
+    if parent not in _MADE_DIRS:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        _MADE_DIRS.add(parent)
+    out.write_bytes(buf.getbuffer())
 
+    print(f"  ✓ Filled {filled} fields → {output_path}")
+    _report_unmatched(unmatched)
     return output_path
 
 
+def fill_pdf_bytes(template_path: str, field_map: dict, data: dict,
+                   regenerate_appearances: bool = False) -> bytes:
+    """Fill a PDF form entirely in memory and return the serialized
+    bytes — no temp file round-trip for callers that only need the
+    buffer (e.g. a download button)."""
+    buf, filled, unmatched = _fill_to_buffer(template_path, field_map, data,
+                                             regenerate_appearances)
+    if buf is None:
+        return b""
+    print(f"  ✓ Filled {filled} fields (in memory)")
+    _report_unmatched(unmatched)
+    return buf.getvalue()
+
+
 # ═════════════════════════════════════════════════════════════════════
 # Pipeline
 # ═════════════════════════════════════════════════════════════════════
 
+_FORM_KEYS = (("acord25", "25"), ("acord27", "27"), ("acord28", "28"), ("acord30", "30"))
+
+
 def determine_forms(data: dict) -> list[str]:
-    forms = []
-    if data.get("acord25") is not None:
-        forms.append("25")
-    if data.get("acord27") is not None:
-        forms.append("27")
-    if data.get("acord28") is not None:
-        forms.append("28")
-    if data.get("acord30") is not None:
-        forms.append("30")
-    return forms
+    return [num for key, num in _FORM_KEYS if data.get(key) is not None]
+
+
+# Templates ship with the app, so existence is checked once per path
+# rather than stat()ed on every run.
+_TEMPLATE_EXISTS: dict[str, bool] = {}
+
+
+def _template_exists(path: str) -> bool:
+    found = _TEMPLATE_EXISTS.get(path)
+    if found is None:
+        found = _TEMPLATE_EXISTS[path] = Path(path).exists()
+    return found
 
 
 def fill_acord_forms(data: dict, output_dir: str, forms: list[str] = None):
@@ -903,26 +1280,39 @@ def fill_acord_forms(data: dict, output_dir: str, forms: list[str] = None):
     results = []
 
     configs = {
-        "25": ("ACORD 25 – Certificate of Liability", ACORD25_FIELDS),
-        "27": ("ACORD 27 – Evidence of Property",     ACORD27_FIELDS),
-        "28": ("ACORD 28 – Evidence of Property",     ACORD28_FIELDS),
-        "30": ("ACORD 30 – Certificate of Garage",    ACORD30_FIELDS),
+        "25": ("ACORD 25 – Certificate of Liability", _ACORD25_PLAN),
+        "27": ("ACORD 27 – Evidence of Property",     _ACORD27_PLAN),
+        "28": ("ACORD 28 – Evidence of Property",     _ACORD28_PLAN),
+        "30": ("ACORD 30 – Certificate of Garage",    _ACORD30_PLAN),
     }
 
+    jobs = []
     for num in forms:
-        template = FORM_PATHS.get(num)
-        if not template or not Path(template).exists():
-            print(f"  ✗ Template not found: {template}")
-            continue
-
+        # Cheap checks first: an unconfigured mapping needs no stat call
         label, fmap = configs[num]
-        if not fmap:
+        if not (fmap.const_names or fmap.func_names):
             print(f"  ⚠ {label}: field mapping not yet configured — skipping")
             continue
 
+        template = FORM_PATHS.get(num)
+        if not template or not _template_exists(template):
+            print(f"  ✗ Template not found: {template}")
+            continue
+
         out = Path(output_dir) / f"acord{num}_{insured}.pdf"
         print(f"\n  Filling {label}...")
-        results.append(fill_pdf(template, str(out), fmap, data))
+        jobs.append((template, str(out), fmap))
+
+    if len(jobs) == 1:
+        template, out, fmap = jobs[0]
+        results.append(fill_pdf(template, out, fmap, data))
+    elif jobs:
+        # Each form reads a different template and writes a different
+        # file, so fill them concurrently. Threads rather than processes:
+        # the field resolvers are lambdas and don't pickle.
+        with ThreadPoolExecutor(max_workers=min(len(jobs), 4)) as ex:
+            futures = [ex.submit(fill_pdf, t, o, m, data) for t, o, m in jobs]
+            results.extend(f.result() for f in futures)
 
     return results
 
@@ -935,7 +1325,7 @@ def main():
         sys.exit(1)
 
     json_path = sys.argv[1]
-    data = json.loads(Path(json_path).read_text())
+    data = _json_loads(Path(json_path).read_bytes())
 
     forms = None
     outdir = "output"
@@ -1,7 +1,7 @@
 """
 Opal V3 Direct — COI Generator
 
-Upload insurance PDFs → classify → extract (2 Claude calls per file) →
+Upload insurance PDFs → classify+extract (1 Claude call per file) →
 edit fields → generate filled ACORD PDF → download.
 
 No reconciliation, no NAIC enrichment, no SOP lookup.
@@ -12,29 +12,78 @@ Usage:
     streamlit run app.py
 """
 
-import anthropic
-import base64
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
+import random
+import shutil
+import threading
+from collections import deque
 import os
 import sys
-import tempfile
+import re
 import time
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
 
 import streamlit as st
 
+try:  # optional: SIMD base64 (AVX2/NEON), several times faster on MB PDFs
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
+
+try:  # optional: C JSON parser for multi-KB extraction responses
+    from orjson import OPT_INDENT_2, dumps as _orjson_dumps
+    from orjson import loads as _json_loads
+
+    def _json_dumps(obj, indent=None):
+        return _orjson_dumps(obj, option=OPT_INDENT_2 if indent else 0).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 # ── Load .env ────────────────────────────────────────────────────────
-for env_path in [Path(__file__).resolve().parent / ".env", Path(__file__).resolve().parent.parent / ".env", Path.home() / ".env"]:
-    if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                k, v = line.split("=", 1)
-                os.environ.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+@lru_cache(maxsize=1)
+def _load_env():
+    """Read candidate .env files into os.environ, once per process.
+
+    Streamlit reruns the whole script on every widget interaction; the
+    cache keeps reruns from re-statting and re-parsing the files."""
+    for env_path in [Path(__file__).resolve().parent / ".env", Path(__file__).resolve().parent.parent / ".env", Path.home() / ".env"]:
+        if env_path.exists():
+            for line in env_path.read_text().splitlines():
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    k, v = line.split("=", 1)
+                    os.environ.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+
+
+_load_env()
 
 APP_DIR = Path(__file__).resolve().parent
 
-from acord_filler import fill_pdf, ACORD25_FIELDS, ACORD27_FIELDS, ACORD30_FIELDS, determine_forms
+
+# Heavy imports (anthropic pulls in httpx/pydantic; acord_filler pulls
+# in pypdf and compiles its field plans) are deferred behind cached
+# loaders so a fresh session renders the page before paying for them.
+@lru_cache(maxsize=1)
+def _anthropic():
+    import anthropic
+    return anthropic
+
+
+@lru_cache(maxsize=1)
+def _acord_filler():
+    import acord_filler
+    return acord_filler
+
+
+# Above this size an inline data-URI preview bloats the DOM (~1.33x in
+# base64) and stalls the browser on every rerun; offer download only.
+PREVIEW_LIMIT_BYTES = 3_000_000
 
 FORM_PATHS = {
     "25": str(APP_DIR / "forms" / "acord25.pdf"),
@@ -42,6 +91,24 @@ FORM_PATHS = {
     "30": str(APP_DIR / "forms" / "acord30.pdf"),
 }
 
+# Download filenames embed the insured's name; map spaces and
+# path-hostile characters to underscores in one translate pass.
+_FILENAME_SAFE = str.maketrans(" /\\:", "____")
+
+# Templates ship with the app and don't move at runtime; stat them once
+# at import instead of per form per Generate click.
+_EXISTING_TEMPLATES = {k: v for k, v in FORM_PATHS.items() if os.path.exists(v)}
+
+
+@lru_cache(maxsize=1)
+def _form_configs():
+    m = _acord_filler()
+    return {
+        "25": ("ACORD 25", m.ACORD25_FIELDS),
+        "27": ("ACORD 27", m.ACORD27_FIELDS),
+        "30": ("ACORD 30", m.ACORD30_FIELDS),
+    }
+
 MODEL = "claude-opus-4-6"
 
 # ── Prompts ──────────────────────────────────────────────────────────
@@ -237,6 +304,26 @@ ALWAYS set `descriptionOfOperations` to `""`. Never populate from document.
 
 Return ONLY the raw JSON object. No markdown fences, no surrounding text."""
 
+# Classification and extraction fused into one call: the PDF is sent and
+# read by the model once, and the reply carries both answers in a single
+# envelope. Halves round trips and input tokens per file.
+CLASSIFY_EXTRACT_PROMPT = EXTRACT_PROMPT.rsplit("## OUTPUT", 1)[0] + """## CLASSIFICATION
+
+Also classify the document. Valid types: binder, policy_declaration, endorsement, prior_coi, confirmation, quote, email_only
+
+Key signals:
+- "Binder" / "This confirms binding" -> binder
+- "Declarations" / "Dec Page" -> policy_declaration
+- "Endorsement" / "Amendment" / "Rider" -> endorsement
+- "Certificate of Insurance" / ACORD form -> prior_coi
+- "Quote" / "Indication" / "Proposal" -> quote
+
+## OUTPUT
+
+Return ONLY a raw JSON envelope — no markdown fences, no surrounding text:
+{"doc_type": "<type>", "confidence": <0.0-1.0>, "extraction": <the JSON template above>}"""
+
+
 RECONCILE_PROMPT = """You are an insurance data reconciliation specialist. You are given multiple JSON extractions from different insurance documents for the SAME insured. Your job is to merge them into a single unified JSON.
 
 ## RULES
@@ -289,30 +376,333 @@ Return ONLY the raw JSON object using the same template structure as the input e
 
 # ── Claude helpers ───────────────────────────────────────────────────
 
+# Content-addressed response cache: re-extracting an identical PDF with
+# the same prompt and model is a dict-file hit instead of a multi-second
+# Claude call. Keyed on sha256(model | prompt | pdf bytes).
+_CACHE_DIR = APP_DIR / ".opal_cache"
+
+
+def _cache_key(system, pdf_bytes):
+    h = hashlib.sha256()
+    h.update(MODEL.encode())
+    h.update(b"|")
+    h.update(system.encode())
+    h.update(b"|")
+    h.update(pdf_bytes)
+    return h.hexdigest()
+
+
+def _cache_get(key):
+    try:
+        return (_CACHE_DIR / f"{key}.json").read_text()
+    except OSError:
+        return None
+
+
+def _cache_put(key, raw):
+    _CACHE_DIR.mkdir(exist_ok=True)
+    tmp = _CACHE_DIR / f".{key}.tmp"
+    tmp.write_text(raw)
+    tmp.replace(_CACHE_DIR / f"{key}.json")  # atomic on POSIX
+
+
+def _pool_kwargs():
+    """Connection settings shared by both clients: one pool sized for the
+    concurrent per-file calls, HTTP/2 when the h2 package is installed so
+    parallel requests multiplex over a single TLS connection."""
+    import httpx  # the SDK's transport layer
+    from importlib.util import find_spec
+    return {
+        "http2": find_spec("h2") is not None,
+        "limits": httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        "timeout": 120,
+    }
+
+
 def get_client():
     key = os.environ.get("ANTHROPIC_API_KEY")
     if not key:
         return None
-    return anthropic.Anthropic(api_key=key)
+    import httpx
+    return _anthropic().Anthropic(api_key=key, http_client=httpx.Client(**_pool_kwargs()))
+
+
+def get_async_client():
+    key = os.environ.get("ANTHROPIC_API_KEY")
+    if not key:
+        return None
+    import httpx
+    # Built per extraction run: httpx async pools bind to the running
+    # event loop, so the client can't be cached across asyncio.run calls.
+    # The beta header lets messages reference Files API uploads by id.
+    return _anthropic().AsyncAnthropic(
+        api_key=key,
+        http_client=httpx.AsyncClient(**_pool_kwargs()),
+        default_headers={"anthropic-beta": "files-api-2025-04-14"},
+    )
+
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\n?|\n?```$")
 
 
 def strip_fences(text):
-    t = text.strip()
-    if t.startswith("```"):
-        t = t.split("\n", 1)[1] if "\n" in t else t[3:]
-    if t.endswith("```"):
-        t = t[:-3]
-    return t.strip()
+    # Both fences go in one C-level regex pass; unlike the hand-rolled
+    # version this also handles a language tag with no newline after it
+    # ("```json{...}") without eating into the payload.
+    return _FENCE_RE.sub("", text.strip()).strip()
+
+
+_FILENAME_TYPE_RE = re.compile(
+    r"(?P<binder>binder)|(?P<policy_declaration>dec(?:laration)?s?[ _-]?page|dec\b)"
+    r"|(?P<endorsement>endorsement|rider)|(?P<prior_coi>\bcoi\b|certificate)"
+    r"|(?P<quote>quote|indication|proposal)",
+    re.IGNORECASE,
+)
+
+
+def quick_classify(filename, pdf_bytes):
+    """Cheap local classification from the filename and page count.
+
+    Returns (doc_type, confidence) for small, clearly named PDFs, else
+    None. Used when the model's own classification is unavailable — the
+    fused classify+extract call normally returns the type for free."""
+    m = _FILENAME_TYPE_RE.search(filename)
+    if not m:
+        return None
+    try:
+        from pypdf import PdfReader
+        pages = len(PdfReader(BytesIO(pdf_bytes)).pages)
+    except Exception:
+        return None
+    if pages > 2:
+        return None
+    return m.lastgroup, 0.95
+
+
+def _system_blocks(system):
+    # Block form with cache_control so Anthropic caches the static system
+    # prompt server-side; repeat calls within the cache TTL pay a fraction
+    # of the token cost and skip re-processing those tokens.
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+class _TokenBucketLimiter:
+    """Client-side RPM/TPM throttle over sliding 60s windows.
+
+    reserve() books the call under the lock and returns how long the
+    caller must sleep first, so both the sync and async paths shape
+    their traffic instead of burning wall time in 429 retries."""
+
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = deque()          # issue timestamps
+        self._tokens = deque()            # (issue timestamp, est tokens)
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens):
+        with self._lock:
+            now = time.monotonic()
+            while self._requests and now - self._requests[0] > 60:
+                self._requests.popleft()
+            while self._tokens and now - self._tokens[0][0] > 60:
+                self._tokens.popleft()
+            wait = 0.0
+            if len(self._requests) >= self.rpm:
+                wait = max(wait, 60 - (now - self._requests[0]))
+            if self._tokens and sum(t for _, t in self._tokens) + tokens > self.tpm:
+                wait = max(wait, 60 - (now - self._tokens[0][0]))
+            at = now + wait
+            self._requests.append(at)
+            self._tokens.append((at, tokens))
+            return wait
+
+
+def _estimate_tokens(system, user_content, max_tokens):
+    # ~4 chars per token for text, flat allowance per attached PDF
+    est = len(system) // 4 + max_tokens // 2
+    for block in user_content:
+        est += len(block["text"]) // 4 if block.get("type") == "text" else 1500
+    return est
+
+
+_LIMITER = _TokenBucketLimiter(
+    rpm=int(os.environ.get("OPAL_RPM", "40")),
+    tpm=int(os.environ.get("OPAL_TPM", "80000")),
+)
+
+
+def _retry_wait(e, attempt):
+    """Seconds to wait before retrying a transient API error, honoring a
+    retry-after header when present; None if the error isn't retryable."""
+    a = _anthropic()
+    if isinstance(e, (a.RateLimitError, a.APIConnectionError)):
+        pass
+    elif isinstance(e, a.APIStatusError) and e.status_code >= 500:
+        pass
+    else:
+        return None
+    response = getattr(e, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(30.0, float(retry_after))
+        except ValueError:
+            pass
+    return min(30.0, 2 ** attempt + random.random())
+
+
+_MAX_ATTEMPTS = 3
 
 
 def call_claude(client, system, user_content, max_tokens=8192):
-    resp = client.messages.create(
-        model=MODEL,
-        max_tokens=max_tokens,
-        system=system,
-        messages=[{"role": "user", "content": user_content}],
-    )
-    return strip_fences(resp.content[0].text)
+    wait = _LIMITER.reserve(_estimate_tokens(system, user_content, max_tokens))
+    if wait > 0:
+        time.sleep(wait)
+    # Stream rather than block on messages.create: chunks accumulate as
+    # they are generated, so a stalled long generation can't hold the
+    # whole response hostage and the SDK keeps the connection warm.
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            with client.messages.stream(
+                model=MODEL,
+                max_tokens=max_tokens,
+                system=_system_blocks(system),
+                messages=[{"role": "user", "content": user_content}],
+            ) as stream:
+                parts = [text for text in stream.text_stream]
+            return strip_fences("".join(parts))
+        except Exception as e:
+            delay = _retry_wait(e, attempt)
+            if delay is None or attempt == _MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(delay)
+
+
+async def call_claude_async(client, sem, system, user_content, max_tokens=8192):
+    async with sem:
+        wait = _LIMITER.reserve(_estimate_tokens(system, user_content, max_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                async with client.messages.stream(
+                    model=MODEL,
+                    max_tokens=max_tokens,
+                    system=_system_blocks(system),
+                    messages=[{"role": "user", "content": user_content}],
+                ) as stream:
+                    parts = [text async for text in stream.text_stream]
+                return strip_fences("".join(parts))
+            except Exception as e:
+                delay = _retry_wait(e, attempt)
+                if delay is None or attempt == _MAX_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(delay)
+
+
+async def _process_file(client, sem, f, use_cache=True):
+    """Classify and extract one uploaded PDF in a single Claude call.
+
+    Returns (classification, extraction)."""
+    try:
+        key = _cache_key(CLASSIFY_EXTRACT_PROMPT, f["bytes"])
+        raw = _cache_get(key) if use_cache else None
+        if raw is None:
+            # Upload once and reference by id: the request body stays small
+            # and Python never builds a base64 copy of the PDF.
+            async with sem:
+                upload = await client.beta.files.upload(
+                    file=(f["filename"], f["bytes"], "application/pdf"),
+                )
+            doc = {"type": "document", "source": {"type": "file", "file_id": upload.id}}
+            raw = await call_claude_async(client, sem, CLASSIFY_EXTRACT_PROMPT, [
+                doc,
+                {"type": "text", "text": "Classify this insurance document and extract all data into the JSON template."},
+            ])
+            # Parse before caching: a malformed reply must stay
+            # retryable, not poison every rerun of this document.
+            parsed = _json_loads(raw)
+            _cache_put(key, raw)
+        else:
+            parsed = _json_loads(raw)
+        doc_type = parsed.get("doc_type", "unknown")
+        confidence = parsed.get("confidence", 0)
+        extraction = parsed.get("extraction") or {}
+    except Exception as e:
+        st.warning(f"Extraction failed for {f['filename']}: {e}")
+        # Fall back to the local heuristic so the UI can still label
+        # the document even though the model call failed.
+        guessed = quick_classify(f["filename"], f["bytes"])
+        doc_type, confidence = guessed if guessed else ("unknown", 0)
+        extraction = {}
+
+    return {"filename": f["filename"], "doc_type": doc_type, "confidence": confidence}, extraction
+
+
+async def _process_all_files(files, progress, max_pct, use_cache=True):
+    """Run classify+extract for every file concurrently, with in-flight
+    calls capped by OPAL_CONCURRENCY (default 8)."""
+    client = get_async_client()
+    sem = asyncio.Semaphore(int(os.environ.get("OPAL_CONCURRENCY", "8")))
+    tasks = [asyncio.ensure_future(_process_file(client, sem, f, use_cache)) for f in files]
+    done = 0
+    for fut in asyncio.as_completed(tasks):
+        await fut
+        done += 1
+        progress.progress(min(int(done / len(files) * max_pct), max_pct - 1),
+                          text=f"Processed {done}/{len(files)} file(s)...")
+    return [t.result() for t in tasks]
+
+
+def batch_extract(client, files, progress, max_pct):
+    """Run the fused classify+extract for all files through the Message
+    Batches API: one submission, poll until ended, then map results back
+    by custom_id. Batch traffic is priced at half the standard rate, at
+    the cost of queueing latency — only worth it for multi-file jobs."""
+    requests = [
+        {
+            "custom_id": f"doc-{i}",
+            "params": {
+                "model": MODEL,
+                "max_tokens": 8192,
+                "system": _system_blocks(CLASSIFY_EXTRACT_PROMPT),
+                "messages": [{"role": "user", "content": [
+                    {"type": "document", "source": {"type": "base64", "media_type": "application/pdf",
+                                                    "data": _b64encode(f["bytes"]).decode("ascii")}},
+                    {"type": "text", "text": "Classify this insurance document and extract all data into the JSON template."},
+                ]}],
+            },
+        }
+        for i, f in enumerate(files)
+    ]
+    batch = client.messages.batches.create(requests=requests)
+    wait = 2.0
+    while True:
+        batch = client.messages.batches.retrieve(batch.id)
+        if batch.processing_status == "ended":
+            break
+        progress.progress(max_pct // 2, text=f"Batch {batch.processing_status}...")
+        time.sleep(wait)
+        wait = min(wait * 1.5, 30)
+
+    by_id = {entry.custom_id: entry for entry in client.messages.batches.results(batch.id)}
+    results = []
+    for i, f in enumerate(files):
+        entry = by_id.get(f"doc-{i}")
+        doc_type, confidence, extraction = "unknown", 0, {}
+        try:
+            if entry is not None and entry.result.type == "succeeded":
+                parsed = _json_loads(strip_fences(entry.result.message.content[0].text))
+                doc_type = parsed.get("doc_type", "unknown")
+                confidence = parsed.get("confidence", 0)
+                extraction = parsed.get("extraction") or {}
+            else:
+                st.warning(f"Batch request failed for {f['filename']}")
+        except Exception as e:
+            st.warning(f"Extraction failed for {f['filename']}: {e}")
+        results.append(({"filename": f["filename"], "doc_type": doc_type, "confidence": confidence}, extraction))
+    return results
 
 
 # ── Page config ──────────────────────────────────────────────────────
@@ -323,87 +713,124 @@ st.set_page_config(
     layout="wide",
 )
 
-# ── Load env ─────────────────────────────────────────────────────────
-for env_path in [Path(__file__).parent / ".env"]:
-    if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                k, v = line.split("=", 1)
-                os.environ.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+_COMMA_TAB = str.maketrans("", "", ",")
+# ASCII-only int check: str.isdigit() accepts superscripts ("²") that
+# make int() raise, and rejects the leading minus of a negative amount.
+_INT_RE = re.compile(r"-?\d{1,15}$")
+
+
+def _parse_money(val):
+    """Parse a money text input: ''/'none' -> None, 'excluded' ->
+    'Excluded', digits (with or without commas) -> int, anything else
+    kept verbatim. translate() strips commas at C level without
+    allocating when there are none."""
+    s = val.strip()
+    if not s or s.lower() == "none":
+        return None
+    if s.lower() == "excluded":
+        return "Excluded"
+    t = s.translate(_COMMA_TAB)
+    return int(t) if _INT_RE.match(t) else val
+
+
+def _limits_editor(obj, fields, key):
+    """Render a block of money limits as one st.data_editor instead of a
+    text_input per field, so an edit pass diffs a single widget rather
+    than one per limit. Writes parsed values back into obj."""
+    rows = [
+        {"Limit": k.replace("_", " ").title(),
+         "Value": "" if obj.get(k) is None else str(obj.get(k))}
+        for k in fields
+    ]
+    edited = st.data_editor(rows, key=key, num_rows="fixed", hide_index=True,
+                            disabled=["Limit"], use_container_width=True)
+    for k, row in zip(fields, edited):
+        obj[k] = _parse_money(str(row["Value"]))
 
 
 def _preserve_fields(reconciled, extractions):
     """Ensure reconciliation never blanks out fields that existed in any source extraction."""
-    COVERAGE_SECTIONS = {
-        "acord25": ["gl", "auto", "umbrella", "workersComp"],
-        "acord27": None,
-        "acord28": None,
-        "acord30": None,
-    }
-    for form_key, sections in COVERAGE_SECTIONS.items():
-        if sections:
-            for section in sections:
-                merged_section = (reconciled.get(form_key) or {}).get(section, {})
-                if not isinstance(merged_section, dict):
-                    continue
-                for ext in extractions:
-                    source_section = (ext.get(form_key) or {}).get(section, {})
-                    if not isinstance(source_section, dict):
-                        continue
-                    for field, value in source_section.items():
-                        if value and not merged_section.get(field):
-                            merged_section[field] = value
-                if merged_section:
-                    reconciled.setdefault(form_key, {})[section] = merged_section
-        else:
-            merged_form = reconciled.get(form_key) or {}
-            if not isinstance(merged_form, dict):
-                continue
-            for ext in extractions:
-                source_form = ext.get(form_key) or {}
-                if not isinstance(source_form, dict):
-                    continue
-                for field, value in source_form.items():
-                    if isinstance(value, dict):
-                        merged_sub = merged_form.get(field, {})
-                        if not isinstance(merged_sub, dict):
-                            continue
-                        for k, v in value.items():
-                            if v and not merged_sub.get(k):
-                                merged_sub[k] = v
-                        merged_form[field] = merged_sub
-                    elif value and not merged_form.get(field):
-                        merged_form[field] = value
-                reconciled[form_key] = merged_form
-
-    for top_key in ["insured", "producer", "endorsements", "certificateHolder"]:
-        merged_top = reconciled.get(top_key, {})
-        if not isinstance(merged_top, dict):
-            continue
-        for ext in extractions:
-            source_top = ext.get(top_key, {})
-            if not isinstance(source_top, dict):
-                continue
-            for field, value in source_top.items():
-                if value and not merged_top.get(field):
-                    merged_top[field] = value
-        reconciled[top_key] = merged_top
+
+    def _fill(dst, src):
+        for field, value in src.items():
+            if value and not dst.get(field):
+                dst[field] = value
+
+    # Resolve every merge target once up front, then fill them all in a
+    # single pass over the extractions instead of re-walking the merged
+    # document for each section, top-level key, and carrier.
+    a25 = reconciled.get("acord25") or {}
+    a25_sections = {}
+    for section in ("gl", "auto", "umbrella", "workersComp"):
+        merged = a25.get(section, {})
+        if isinstance(merged, dict):
+            a25_sections[section] = merged
+
+    simple_forms = {}
+    for form_key in ("acord27", "acord28", "acord30"):
+        merged = reconciled.get(form_key) or {}
+        if isinstance(merged, dict):
+            simple_forms[form_key] = merged
+
+    top_keys = {}
+    for top_key in ("insured", "producer", "endorsements", "certificateHolder"):
+        merged = reconciled.get(top_key, {})
+        if isinstance(merged, dict):
+            top_keys[top_key] = merged
+
+    carriers_by_name = {}
+    for c in reconciled.get("carriers", []):
+        carriers_by_name.setdefault(c.get("name"), c)
 
     for ext in extractions:
+        ext_a25 = ext.get("acord25") or {}
+        if isinstance(ext_a25, dict):
+            for section, merged in a25_sections.items():
+                src = ext_a25.get(section, {})
+                if isinstance(src, dict):
+                    _fill(merged, src)
+
+        for form_key, merged in simple_forms.items():
+            src = ext.get(form_key) or {}
+            if not isinstance(src, dict):
+                continue
+            for field, value in src.items():
+                if isinstance(value, dict):
+                    sub = merged.get(field, {})
+                    if not isinstance(sub, dict):
+                        continue
+                    _fill(sub, value)
+                    merged[field] = sub
+                elif value and not merged.get(field):
+                    merged[field] = value
+
+        for top_key, merged in top_keys.items():
+            src = ext.get(top_key, {})
+            if isinstance(src, dict):
+                _fill(merged, src)
+
         for c in ext.get("carriers", []):
             name = c.get("name", "")
-            if not name:
-                continue
-            existing = [x for x in reconciled.get("carriers", []) if x.get("name") == name]
-            if existing:
-                for field, value in c.items():
-                    if value and not existing[0].get(field):
-                        existing[0][field] = value
+            target = carriers_by_name.get(name) if name else None
+            if target is not None:
+                _fill(target, c)
+
+    for section, merged in a25_sections.items():
+        if merged:
+            reconciled.setdefault("acord25", {})[section] = merged
+    if extractions:
+        for form_key, merged in simple_forms.items():
+            reconciled[form_key] = merged
+    for top_key, merged in top_keys.items():
+        reconciled[top_key] = merged
 
     return reconciled
 
 
+def _has_form_data(ext):
+    return any(ext.get(k) for k in ("acord25", "acord27", "acord28", "acord30"))
+
+
 def reconcile_extractions(client, extractions, classifications):
     """Send all per-document extractions to Claude for intelligent reconciliation."""
     labeled = []
@@ -412,23 +839,149 @@ def reconcile_extractions(client, extractions, classifications):
         doc_type = classifications[i]["doc_type"] if i < len(classifications) else "unknown"
         labeled.append({"source": label, "doc_type": doc_type, "extraction": ext})
 
+    payload = _json_dumps(labeled, indent=2)
     user_content = [
-        {"type": "text", "text": f"Reconcile these {len(labeled)} extractions into a single unified JSON:\n\n" +
-         json.dumps(labeled, indent=2)},
+        {"type": "text", "text": f"Reconcile these {len(labeled)} extractions into a single unified JSON:\n\n" + payload},
     ]
 
     try:
-        raw = call_claude(client, RECONCILE_PROMPT, user_content, max_tokens=16384)
-        result = json.loads(raw)
+        # Same on-disk cache as extraction: the payload is a pure function
+        # of the uploaded documents, so a rerun over the same set (e.g.
+        # after editing fields downstream) skips the 16k-token call.
+        key = _cache_key(RECONCILE_PROMPT, payload.encode())
+        raw = _cache_get(key)
+        if raw is None:
+            raw = call_claude(client, RECONCILE_PROMPT, user_content, max_tokens=16384)
+            # Parse before caching so a malformed reply stays retryable.
+            result = _json_loads(raw)
+            _cache_put(key, raw)
+        else:
+            result = _json_loads(raw)
         return _preserve_fields(result, extractions)
     except Exception as e:
         st.warning(f"Reconciliation failed: {e}. Using first extraction as fallback.")
         return extractions[0] if extractions else {}
 
 
+@st.cache_data(show_spinner=False)
+def _encode_pdf(file_bytes: bytes) -> str:
+    """Base64 for one uploaded PDF, cached on content so the preview
+    iframe and the Claude document block share a single encode and
+    Streamlit reruns don't redo it."""
+    return _b64encode(file_bytes).decode("ascii")
+
+
+def _render_pdf_result(form_num, label, pdf_bytes, insured_name):
+    """Download button for one generated form; returns the preview
+    iframe HTML (or None when too large) so the caller can batch all
+    previews into a single markdown delta."""
+    filename = f"acord{form_num}_{insured_name}.pdf"
+    st.download_button(
+        f"⬇️ Download {label}",
+        data=pdf_bytes,
+        file_name=filename,
+        mime="application/pdf",
+        key=f"dl_{form_num}",
+    )
+    if len(pdf_bytes) > PREVIEW_LIMIT_BYTES:
+        st.info("PDF too large for inline preview — use the download button.")
+        return None
+    b64_pdf = _encode_pdf(pdf_bytes)
+    return (f'<h4>{label}</h4>'
+            f'<iframe src="data:application/pdf;base64,{b64_pdf}" '
+            f'width="100%" height="800" type="application/pdf"></iframe>')
+
+
+@st.fragment
+def _generate_section(result, forms):
+    """Section 4: form selection, generation and previews. A fragment so
+    Generate clicks and multiselect changes rerun only this block, and
+    edits elsewhere don't re-render it beyond the full-script pass."""
+    st.header("4. Generate ACORD PDF")
+
+    valid_options = ["25", "27", "28", "30"]
+    # determine_forms already yields bare numbers ("25", ...); the
+    # old "ACORD "-prefix strip dated from a label-returning version.
+    forms_to_generate = [f for f in forms if f in valid_options]
+
+    selected_forms = st.multiselect(
+        "Select forms to generate",
+        options=valid_options,
+        default=forms_to_generate or ["25"],
+    )
+
+    if st.button("📄 Generate PDF", type="primary"):
+        with st.spinner("Generating ACORD PDF(s)..."):
+            # Repeat clicks with unchanged data serve the previous fill
+            # from session state. One generation is kept — a new digest
+            # drops the old PDFs rather than growing without bound.
+            rkey = hashlib.blake2b(
+                json.dumps(result, sort_keys=True, default=str).encode(),
+                digest_size=16).digest()
+            cache = st.session_state.get("_pdf_cache")
+            if cache is None or cache["rkey"] != rkey:
+                cache = {"rkey": rkey, "pdfs": {}}
+                st.session_state["_pdf_cache"] = cache
+
+            entries = []  # (form_num, label, bytes or None) in selection order
+            jobs = []
+            for form_num in selected_forms:
+                template = _EXISTING_TEMPLATES.get(form_num)
+                if template is None:
+                    st.warning(f"Template not found: {FORM_PATHS.get(form_num, form_num)}")
+                    continue
+
+                if form_num not in _form_configs():
+                    st.warning(f"ACORD {form_num} field mapping not available")
+                    continue
+
+                label, field_map = _form_configs()[form_num]
+                entries.append((form_num, label, cache["pdfs"].get(form_num)))
+                if cache["pdfs"].get(form_num) is None:
+                    jobs.append((form_num, label, template, field_map))
+
+            def _fill_one(job):
+                form_num, label, template, field_map = job
+                pdf_bytes = _acord_filler().fill_pdf_bytes(template, field_map, result)
+                return form_num, label, pdf_bytes
+
+            # The selected forms are independent fills of different
+            # templates; run them together when there's more than one.
+            if len(jobs) == 1:
+                filled = [_fill_one(jobs[0])]
+            elif jobs:
+                with ThreadPoolExecutor(max_workers=len(jobs)) as ex:
+                    filled = list(ex.map(_fill_one, jobs))
+            else:
+                filled = []
+
+            for form_num, _label, pdf_bytes in filled:
+                cache["pdfs"][form_num] = pdf_bytes
+
+            generated = [(form_num, label, pdf_bytes or cache["pdfs"][form_num])
+                         for form_num, label, pdf_bytes in entries]
+
+            # Persist so the results survive unrelated reruns (the
+            # button is only True on the click itself).
+            st.session_state["generated_pdfs"] = generated
+            if generated:
+                st.success(f"Generated {len(generated)} ACORD form(s)")
+
+    if st.session_state.get("generated_pdfs"):
+        insured_name = (result.get("insured") or {}).get("name", "Unknown").translate(_FILENAME_SAFE) or "Unknown"
+        # One markdown delta (and one DOM reflow) for all previews
+        # instead of a render message per form.
+        previews = [
+            html for form_num, label, pdf_bytes in st.session_state["generated_pdfs"]
+            if (html := _render_pdf_result(form_num, label, pdf_bytes, insured_name))
+        ]
+        if previews:
+            st.markdown("".join(previews), unsafe_allow_html=True)
+
+
 def main():
     st.title("Opal V3 Direct — COI Generator")
-    st.caption("Direct Claude extraction (2 calls per file) — no reconciliation, no NAIC enrichment")
+    st.caption("Direct Claude extraction (1 call per file) — no NAIC enrichment")
 
     # ── Sidebar ──────────────────────────────────────────────────────
     with st.sidebar:
@@ -441,6 +994,16 @@ def main():
         else:
             st.success("API key loaded from .env")
 
+        batch_mode = st.checkbox(
+            "Batch mode (cheaper, slower)",
+            value=False,
+            help="Send multi-file jobs through the Message Batches API at 50% cost; results can take minutes.",
+        )
+
+        if st.button("Clear extraction cache"):
+            shutil.rmtree(_CACHE_DIR, ignore_errors=True)
+            st.toast("Extraction cache cleared")
+
         st.divider()
         st.header("Pipeline Status")
         if "elapsed" in st.session_state:
@@ -462,27 +1025,24 @@ def main():
             st.write(f"- {f.name} ({f.size // 1024}KB)")
 
         with st.expander("Preview uploaded PDFs", expanded=False):
-            if len(uploaded_files) == 1:
-                pdf_bytes = uploaded_files[0].read()
-                uploaded_files[0].seek(0)
-                b64 = base64.b64encode(pdf_bytes).decode("utf-8")
+            def _preview(pdf_bytes):
+                if len(pdf_bytes) > PREVIEW_LIMIT_BYTES:
+                    st.info("PDF too large for inline preview.")
+                    return
+                b64 = _encode_pdf(pdf_bytes)
                 st.markdown(
                     f'<iframe src="data:application/pdf;base64,{b64}" '
                     f'width="100%" height="600px" style="border: 1px solid #e5e7eb; border-radius: 8px;"></iframe>',
                     unsafe_allow_html=True,
                 )
+
+            if len(uploaded_files) == 1:
+                _preview(uploaded_files[0].getvalue())
             else:
                 preview_tabs = st.tabs([f.name for f in uploaded_files])
                 for tab, f in zip(preview_tabs, uploaded_files):
                     with tab:
-                        pdf_bytes = f.read()
-                        f.seek(0)
-                        b64 = base64.b64encode(pdf_bytes).decode("utf-8")
-                        st.markdown(
-                            f'<iframe src="data:application/pdf;base64,{b64}" '
-                            f'width="100%" height="600px" style="border: 1px solid #e5e7eb; border-radius: 8px;"></iframe>',
-                            unsafe_allow_html=True,
-                        )
+                        _preview(f.getvalue())
 
     # ── Extract Button ───────────────────────────────────────────────
     col1, col2 = st.columns([1, 3])
@@ -500,58 +1060,37 @@ def main():
             st.error("ANTHROPIC_API_KEY not set")
             st.stop()
 
-        files = []
-        for f in uploaded_files:
-            b64 = base64.standard_b64encode(f.read()).decode("utf-8")
-            files.append({"filename": f.name, "base64": b64})
+        files = [{"filename": f.name, "bytes": f.getvalue()} for f in uploaded_files]
 
         with st.spinner("Running direct Claude extraction..."):
             progress = st.progress(0, text="Starting extraction...")
             start = time.time()
 
-            all_classifications = []
-            all_extractions = []
-
             max_pct = 90 if len(files) > 1 else 100
-            for i, f in enumerate(files):
-                file_pct = int((i / len(files)) * max_pct)
-                step = max(1, int(max_pct / len(files)))
-
-                progress.progress(min(file_pct + step // 4, max_pct - 1), text=f"Classifying {f['filename']}...")
-                try:
-                    raw = call_claude(client, CLASSIFY_PROMPT, [
-                        {"type": "document", "source": {"type": "base64", "media_type": "application/pdf", "data": f["base64"]}},
-                        {"type": "text", "text": "Classify this insurance document."},
-                    ], max_tokens=512)
-                    parsed = json.loads(raw)
-                    doc_type = parsed.get("doc_type", "unknown")
-                    confidence = parsed.get("confidence", 0)
-                except Exception as e:
-                    st.warning(f"Classification failed for {f['filename']}: {e}")
-                    doc_type, confidence = "unknown", 0
-
-                all_classifications.append({"filename": f["filename"], "doc_type": doc_type, "confidence": confidence})
-
-                progress.progress(min(file_pct + step * 3 // 4, max_pct - 1), text=f"Extracting {f['filename']} ({doc_type})...")
-                try:
-                    raw = call_claude(client, EXTRACT_PROMPT, [
-                        {"type": "document", "source": {"type": "base64", "media_type": "application/pdf", "data": f["base64"]}},
-                        {"type": "text", "text": f"This is a {doc_type} document. Extract all data into the JSON template."},
-                    ])
-                    extraction = json.loads(raw)
-                    all_extractions.append(extraction)
-                except Exception as e:
-                    st.warning(f"Extraction failed for {f['filename']}: {e}")
-                    all_extractions.append({})
+            if batch_mode and len(files) >= 2:
+                results = batch_extract(client, files, progress, max_pct)
+            else:
+                use_cache = "no-cache" not in st.query_params
+                results = asyncio.run(_process_all_files(files, progress, max_pct, use_cache))
+            all_classifications = [c for c, _ in results]
+            all_extractions = [e for _, e in results]
 
             elapsed = time.time() - start
             progress.progress(100, text=f"Done in {elapsed:.1f}s")
 
-            if len(all_extractions) > 1:
+            populated = [e for e in all_extractions if _has_form_data(e)]
+            if len(all_extractions) <= 1:
+                primary = all_extractions[0] if all_extractions else {}
+            elif len(populated) <= 1 or sum(len(_json_dumps(e)) for e in all_extractions) < 2000:
+                # The LLM adds nothing when at most one document carried
+                # form data (or the extractions are trivially small):
+                # merge mechanically instead of a 16k-token round trip.
+                primary = _preserve_fields(dict(populated[0]) if populated else {}, all_extractions)
+                primary.setdefault("_notes", []).insert(
+                    0, f"Reconciliation skipped: merged {len(all_extractions)} extractions mechanically")
+            else:
                 progress.progress(95, text="Reconciling extractions across documents...")
                 primary = reconcile_extractions(client, all_extractions, all_classifications)
-            else:
-                primary = all_extractions[0] if all_extractions else {}
 
             st.session_state["extraction_result"] = primary
             st.session_state["classifications"] = all_classifications
@@ -572,7 +1111,10 @@ def main():
             carriers = result.get("carriers", [])
             st.metric("Carriers", len(carriers))
         with col3:
-            forms = determine_forms(result)
+            # Computed once per rerun; the edit tabs below change field
+            # values but never add or remove a form section, so Section 4
+            # reuses this list instead of re-deriving it.
+            forms = _acord_filler().determine_forms(result)
             st.metric("Forms", ", ".join(f"ACORD {f}" for f in forms) or "None")
         with col4:
             st.metric("Time", f"{st.session_state.get('elapsed', 0):.1f}s")
@@ -592,193 +1134,121 @@ def main():
         st.header("3. Edit Extraction")
         st.caption("Modify any field before generating the PDF")
 
-        tabs = st.tabs(["Producer & Insured", "Carriers", "GL Coverage", "Auto", "Umbrella", "Workers Comp", "Certificate Holder", "Endorsements", "Raw JSON"])
-
-        with tabs[0]:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.subheader("Producer")
-                producer = result.setdefault("producer", {})
-                producer["name"] = st.text_input("Producer Name", producer.get("name", ""))
-                producer["contactName"] = st.text_input("Contact", producer.get("contactName", ""))
-                producer["phone"] = st.text_input("Phone", producer.get("phone", ""))
-                producer["email"] = st.text_input("Email", producer.get("email", ""))
-                producer["address"] = st.text_input("Address", producer.get("address", ""))
-            with col2:
-                st.subheader("Insured")
-                insured_obj = result.setdefault("insured", {})
-                insured_obj["name"] = st.text_input("Insured Name", insured_obj.get("name", ""))
-                insured_obj["address"] = st.text_input("Insured Address", insured_obj.get("address", ""))
-
-        with tabs[1]:
-            carriers = result.get("carriers", [])
-            for i, c in enumerate(carriers):
-                col1, col2, col3 = st.columns([1, 4, 2])
-                with col1:
-                    c["letter"] = st.text_input(f"Letter #{i+1}", c.get("letter", ""), key=f"cl_{i}")
-                with col2:
-                    c["name"] = st.text_input(f"Carrier #{i+1}", c.get("name", ""), key=f"cn_{i}")
-                with col3:
-                    c["naic"] = st.text_input(f"NAIC #{i+1}", c.get("naic", ""), key=f"cnaic_{i}")
-
-        with tabs[2]:
-            acord25 = result.get("acord25") or {}
-            gl = acord25.get("gl") or {}
-            if gl:
+        # One form around all the editors: Streamlit reruns the script on
+        # every keystroke otherwise, so batching the ~30 inputs behind a
+        # single submit collapses those reruns to one.
+        with st.form("edit_extraction", clear_on_submit=False):
+            tabs = st.tabs(["Producer & Insured", "Carriers", "GL Coverage", "Auto", "Umbrella", "Workers Comp", "Certificate Holder", "Endorsements", "Raw JSON"])
+
+            with tabs[0]:
                 col1, col2 = st.columns(2)
                 with col1:
-                    gl["insurerLetter"] = st.text_input("Insurer Letter", gl.get("insurerLetter", ""))
-                    gl["policyNumber"] = st.text_input("Policy Number", gl.get("policyNumber", ""))
-                    gl["effectiveDate"] = st.text_input("Effective Date", gl.get("effectiveDate", ""))
-                    gl["expirationDate"] = st.text_input("Expiration Date", gl.get("expirationDate", ""))
-                    gl["occurrence"] = st.checkbox("Occurrence", gl.get("occurrence", False))
-                    gl["claimsMade"] = st.checkbox("Claims Made", gl.get("claimsMade", False))
+                    st.subheader("Producer")
+                    producer = result.setdefault("producer", {})
+                    producer["name"] = st.text_input("Producer Name", producer.get("name", ""))
+                    producer["contactName"] = st.text_input("Contact", producer.get("contactName", ""))
+                    producer["phone"] = st.text_input("Phone", producer.get("phone", ""))
+                    producer["email"] = st.text_input("Email", producer.get("email", ""))
+                    producer["address"] = st.text_input("Address", producer.get("address", ""))
                 with col2:
-                    limits = gl.setdefault("limits", {})
-                    for k in ["eachOccurrence", "damageToRentedPremises", "medicalExpense", "personalAdvInjury", "generalAggregate", "productsCompOp"]:
-                        label = k.replace("_", " ").title()
-                        val = limits.get(k)
-                        display = str(val) if val is not None else ""
-                        new_val = st.text_input(label, display, key=f"gl_{k}")
-                        if new_val == "" or new_val.lower() == "none":
-                            limits[k] = None
-                        elif new_val.lower() == "excluded":
-                            limits[k] = "Excluded"
-                        else:
-                            try:
-                                limits[k] = int(new_val.replace(",", ""))
-                            except ValueError:
-                                limits[k] = new_val
-                acord25["gl"] = gl
-            else:
-                st.info("No GL coverage extracted")
-
-        with tabs[3]:
-            auto = acord25.get("auto")
-            if auto and isinstance(auto, dict):
-                auto["policyNumber"] = st.text_input("Auto Policy Number", auto.get("policyNumber", ""))
-                auto["effectiveDate"] = st.text_input("Auto Effective", auto.get("effectiveDate", ""))
-                auto["expirationDate"] = st.text_input("Auto Expiration", auto.get("expirationDate", ""))
-                val = st.text_input("Combined Single Limit", str(auto.get("combinedSingleLimit", "")))
-                try:
-                    auto["combinedSingleLimit"] = int(val.replace(",", "")) if val else None
-                except ValueError:
-                    pass
-            else:
-                st.info("No auto coverage extracted")
-
-        with tabs[4]:
-            umb = acord25.get("umbrella")
-            if umb and isinstance(umb, dict):
-                umb["policyNumber"] = st.text_input("Umbrella Policy Number", umb.get("policyNumber", ""))
-                val = st.text_input("Umbrella Each Occurrence", str(umb.get("eachOccurrence", "")))
-                try:
-                    umb["eachOccurrence"] = int(val.replace(",", "")) if val else None
-                except ValueError:
-                    pass
-            else:
-                st.info("No umbrella coverage extracted (this is usually correct)")
-
-        with tabs[5]:
-            wc = acord25.get("workersComp")
-            if wc and isinstance(wc, dict):
-                wc["policyNumber"] = st.text_input("WC Policy Number", wc.get("policyNumber", ""))
-                wc["effectiveDate"] = st.text_input("WC Effective", wc.get("effectiveDate", ""))
-                wc["expirationDate"] = st.text_input("WC Expiration", wc.get("expirationDate", ""))
-                for k in ["eachAccident", "diseasePolicyLimit", "diseaseEachEmployee"]:
-                    val = st.text_input(k.replace("_", " ").title(), str(wc.get(k, "")), key=f"wc_{k}")
-                    try:
-                        wc[k] = int(val.replace(",", "")) if val else None
-                    except ValueError:
-                        pass
-            else:
-                st.info("No workers comp coverage extracted")
-
-        with tabs[6]:
-            ch = acord25.get("certificateHolder", {})
-            ch["name"] = st.text_input("Cert Holder Name", ch.get("name", ""))
-            ch["address"] = st.text_input("Cert Holder Address", ch.get("address", ""))
-            acord25["certificateHolder"] = ch
-
-        with tabs[7]:
-            endorsements = acord25.get("endorsements", {})
-            endorsements["additionalInsured"] = st.checkbox("Additional Insured", endorsements.get("additionalInsured", False))
-            endorsements["waiverOfSubrogation"] = st.checkbox("Waiver of Subrogation", endorsements.get("waiverOfSubrogation", False))
-            endorsements["primaryNonContributory"] = st.checkbox("Primary & Non-Contributory", endorsements.get("primaryNonContributory", False))
-            acord25["endorsements"] = endorsements
-
-        with tabs[8]:
-            clean = {k: v for k, v in result.items() if not k.startswith("_")}
-            st.json(clean)
-
+                    st.subheader("Insured")
+                    insured_obj = result.setdefault("insured", {})
+                    insured_obj["name"] = st.text_input("Insured Name", insured_obj.get("name", ""))
+                    insured_obj["address"] = st.text_input("Insured Address", insured_obj.get("address", ""))
+
+            with tabs[1]:
+                carriers = result.get("carriers", [])
+                for i, c in enumerate(carriers):
+                    col1, col2, col3 = st.columns([1, 4, 2])
+                    with col1:
+                        c["letter"] = st.text_input(f"Letter #{i+1}", c.get("letter", ""), key=f"cl_{i}")
+                    with col2:
+                        c["name"] = st.text_input(f"Carrier #{i+1}", c.get("name", ""), key=f"cn_{i}")
+                    with col3:
+                        c["naic"] = st.text_input(f"NAIC #{i+1}", c.get("naic", ""), key=f"cnaic_{i}")
+
+            with tabs[2]:
+                acord25 = result.get("acord25") or {}
+                gl = acord25.get("gl") or {}
+                if gl:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        gl["insurerLetter"] = st.text_input("Insurer Letter", gl.get("insurerLetter", ""))
+                        gl["policyNumber"] = st.text_input("Policy Number", gl.get("policyNumber", ""))
+                        gl["effectiveDate"] = st.text_input("Effective Date", gl.get("effectiveDate", ""))
+                        gl["expirationDate"] = st.text_input("Expiration Date", gl.get("expirationDate", ""))
+                        gl["occurrence"] = st.checkbox("Occurrence", gl.get("occurrence", False))
+                        gl["claimsMade"] = st.checkbox("Claims Made", gl.get("claimsMade", False))
+                    with col2:
+                        limits = gl.setdefault("limits", {})
+                        _limits_editor(limits, ["eachOccurrence", "damageToRentedPremises", "medicalExpense", "personalAdvInjury", "generalAggregate", "productsCompOp"], key="gl_limits")
+                    acord25["gl"] = gl
+                else:
+                    st.info("No GL coverage extracted")
+
+            with tabs[3]:
+                auto = acord25.get("auto")
+                if auto and isinstance(auto, dict):
+                    auto["policyNumber"] = st.text_input("Auto Policy Number", auto.get("policyNumber", ""))
+                    auto["effectiveDate"] = st.text_input("Auto Effective", auto.get("effectiveDate", ""))
+                    auto["expirationDate"] = st.text_input("Auto Expiration", auto.get("expirationDate", ""))
+                    val = st.text_input("Combined Single Limit", str(auto.get("combinedSingleLimit", "")))
+                    auto["combinedSingleLimit"] = _parse_money(val)
+                else:
+                    st.info("No auto coverage extracted")
+
+            with tabs[4]:
+                umb = acord25.get("umbrella")
+                if umb and isinstance(umb, dict):
+                    umb["policyNumber"] = st.text_input("Umbrella Policy Number", umb.get("policyNumber", ""))
+                    val = st.text_input("Umbrella Each Occurrence", str(umb.get("eachOccurrence", "")))
+                    umb["eachOccurrence"] = _parse_money(val)
+                else:
+                    st.info("No umbrella coverage extracted (this is usually correct)")
+
+            with tabs[5]:
+                wc = acord25.get("workersComp")
+                if wc and isinstance(wc, dict):
+                    wc["policyNumber"] = st.text_input("WC Policy Number", wc.get("policyNumber", ""))
+                    wc["effectiveDate"] = st.text_input("WC Effective", wc.get("effectiveDate", ""))
+                    wc["expirationDate"] = st.text_input("WC Expiration", wc.get("expirationDate", ""))
+                    _limits_editor(wc, ["eachAccident", "diseasePolicyLimit", "diseaseEachEmployee"], key="wc_limits")
+                else:
+                    st.info("No workers comp coverage extracted")
+
+            with tabs[6]:
+                ch = acord25.get("certificateHolder", {})
+                ch["name"] = st.text_input("Cert Holder Name", ch.get("name", ""))
+                ch["address"] = st.text_input("Cert Holder Address", ch.get("address", ""))
+                acord25["certificateHolder"] = ch
+
+            with tabs[7]:
+                # Stable keys let Streamlit keep checkbox state in
+                # session_state across reruns; writing into the
+                # setdefault'd dict mutates result in place.
+                endorsements = acord25.setdefault("endorsements", {})
+                for label, end_key, widget_key in (
+                    ("Additional Insured", "additionalInsured", "end_ai"),
+                    ("Waiver of Subrogation", "waiverOfSubrogation", "end_wos"),
+                    ("Primary & Non-Contributory", "primaryNonContributory", "end_pnc"),
+                ):
+                    endorsements[end_key] = st.checkbox(label, endorsements.get(end_key, False), key=widget_key)
+
+            with tabs[8]:
+                # Off by default: st.json re-serializes the whole result
+                # every rerun even when the user is in another tab.
+                if st.checkbox("Show raw JSON", key="show_json"):
+                    clean = {k: v for k, v in result.items() if not k.startswith("_")}
+                    st.code(_json_dumps(clean, indent=2), language="json")
+
+            st.form_submit_button("Apply changes", type="secondary")
+
+        # result IS the session_state dict (fetched above), so in-place
+        # mutation persists; only the possibly-fresh acord25 needs
+        # re-attaching.
         result["acord25"] = acord25
-        st.session_state["extraction_result"] = result
-
-        # ── Section 4: Generate ACORD PDF ────────────────────────────
-        st.header("4. Generate ACORD PDF")
-
-        forms_to_generate = determine_forms(result)
-        forms_to_generate = [f.replace("ACORD ", "") for f in forms_to_generate]
-        valid_options = ["25", "27", "28", "30"]
-        forms_to_generate = [f for f in forms_to_generate if f in valid_options]
-
-        selected_forms = st.multiselect(
-            "Select forms to generate",
-            options=valid_options,
-            default=forms_to_generate or ["25"],
-        )
-
-        if st.button("📄 Generate PDF", type="primary"):
-            with st.spinner("Generating ACORD PDF(s)..."):
-                generated = []
-                form_configs = {
-                    "25": ("ACORD 25", ACORD25_FIELDS),
-                    "27": ("ACORD 27", ACORD27_FIELDS),
-                    "30": ("ACORD 30", ACORD30_FIELDS),
-                }
-
-                for form_num in selected_forms:
-                    template = Path(FORM_PATHS.get(form_num, ""))
-                    if not template.exists():
-                        st.warning(f"Template not found: {template}")
-                        continue
-
-                    if form_num not in form_configs:
-                        st.warning(f"ACORD {form_num} field mapping not available")
-                        continue
-
-                    label, field_map = form_configs[form_num]
-
-                    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-                        output_path = tmp.name
-
-                    fill_pdf(str(template), output_path, field_map, result)
-
-                    pdf_bytes = Path(output_path).read_bytes()
-                    generated.append((form_num, label, pdf_bytes))
-
-                for form_num, label, pdf_bytes in generated:
-                    insured_name = result.get("insured", {}).get("name", "Unknown").replace(" ", "_")
-                    filename = f"acord{form_num}_{insured_name}.pdf"
-
-                    st.download_button(
-                        f"⬇️ Download {label}",
-                        data=pdf_bytes,
-                        file_name=filename,
-                        mime="application/pdf",
-                        key=f"dl_{form_num}",
-                    )
-
-                    b64_pdf = base64.b64encode(pdf_bytes).decode("utf-8")
-                    st.markdown(
-                        f'<iframe src="data:application/pdf;base64,{b64_pdf}" '
-                        f'width="100%" height="800" type="application/pdf"></iframe>',
-                        unsafe_allow_html=True,
-                    )
-
-                if generated:
-                    st.success(f"Generated {len(generated)} ACORD form(s)")
 
+        _generate_section(result, forms)
 
 
 if __name__ == "__main__":